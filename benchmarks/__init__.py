@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import json
+from typing import Callable, Optional
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup():
+    """
+        configure django with benchmarks settings and create tables
+    """
+    import django
+    from django.core.management import call_command
+
+    if _root not in sys.path:
+        sys.path.insert(0, _root)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+    django.setup()
+    call_command('migrate', run_syncdb=True, verbosity=0)
+
+
+def measure(func: Callable, number: int) -> dict:
+    """
+    :return: total seconds and operations per second of calling func number times
+    """
+    started = time.perf_counter()
+    for _ in range(number):
+        func()
+    duration = time.perf_counter() - started
+    return {
+        'number': number,
+        'seconds': round(duration, 4),
+        'per_second': round(number / duration, 1) if duration else None,
+    }
+
+
+def count_queries(func: Callable) -> int:
+    """
+    :return: number of db queries of one call of func
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as context:
+        func()
+    return len(context.captured_queries)
+
+
+def output(results: dict, path: Optional[str] = None):
+    """
+        print results as JSON or write to file
+    """
+    data = json.dumps(results, indent=2, default=str)
+    if path:
+        with open(path, 'w') as file:
+            file.write(data + '\n')
+    else:
+        print(data)
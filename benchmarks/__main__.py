@@ -0,0 +1,50 @@
+"""
+    All benchmarks with JSON output for comparing versions (see benchmarks.compare).
+    python -m benchmarks [--rows N [N ...]] [--number N] [--output results.json]
+"""
+import sys
+import argparse
+import platform
+import datetime
+
+from . import setup, output
+from . import emit
+from . import serialization
+from . import rendering
+
+
+def run(rows_list, number: int) -> dict:
+    import django
+    from django.core.management import call_command
+    from django.db import connection
+
+    results = {
+        'meta': {
+            'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'argv': sys.argv[1:],
+        },
+    }
+    benchmarks = (
+        ('emit', lambda: emit.run(number * 100)),
+        ('serialization', lambda: serialization.run(number * 100)),
+        ('rendering', lambda: rendering.run(rows_list, number)),
+    )
+    for name, func in benchmarks:
+        # every benchmark on empty db
+        call_command('flush', interactive=False, verbosity=0)
+        results[name] = func()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000], help='log records for rendering')
+    parser.add_argument('--number', type=int, default=10, help='repeats of rendering (x100 for emit)')
+    parser.add_argument('--output', help='JSON file, by default - stdout')
+    args = parser.parse_args()
+
+    setup()
+    output(run(args.rows, args.number), args.output)
@@ -0,0 +1,6 @@
+from django.contrib import admin
+
+import sw_logger.admin
+import sw_logger.models
+
+admin.site.register(sw_logger.models.Log, sw_logger.admin.Log)
@@ -0,0 +1,43 @@
+import uuid
+from django.db import models
+
+
+class Tag(models.Model):
+    LOG_NAME = 'bench_tag'
+    name = models.CharField(max_length=100)
+
+    def __str__(self):
+        return self.name
+
+
+class Wide(models.Model):
+    """
+        wide model with fields of all common types
+    """
+    LOG_NAME = 'bench_wide'
+
+    char_1 = models.CharField(max_length=100)
+    char_2 = models.CharField(max_length=100)
+    char_3 = models.CharField(max_length=100)
+    char_4 = models.CharField(max_length=100)
+    char_5 = models.CharField(max_length=100)
+    text_1 = models.TextField(blank=True)
+    text_2 = models.TextField(blank=True)
+    int_1 = models.IntegerField(default=0)
+    int_2 = models.IntegerField(default=0)
+    int_3 = models.BigIntegerField(default=0)
+    float_1 = models.FloatField(default=0)
+    decimal_1 = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    decimal_2 = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    bool_1 = models.BooleanField(default=False)
+    bool_2 = models.BooleanField(default=False)
+    date_1 = models.DateField(null=True)
+    date_2 = models.DateField(null=True)
+    datetime_1 = models.DateTimeField(null=True)
+    datetime_2 = models.DateTimeField(null=True)
+    time_1 = models.TimeField(null=True)
+    uuid_1 = models.UUIDField(default=uuid.uuid4)
+    file_1 = models.FileField(blank=True)
+    json_1 = models.JSONField(default=dict)
+    tag = models.ForeignKey(Tag, null=True, on_delete=models.SET_NULL, related_name='+')
+    tags = models.ManyToManyField(Tag, blank=True)
@@ -0,0 +1,62 @@
+"""
+    Compare results of benchmarks (python -m benchmarks --output ...) of two versions.
+    python -m benchmarks.compare old.json new.json [--threshold 0.1]
+    Exit code 1 - some results are worse than threshold (share).
+"""
+import sys
+import json
+import argparse
+from typing import Iterator, Tuple
+
+# metrics and if greater value is better (total seconds depend on number of calls, so not compared)
+METRICS = {
+    'per_second': True,
+    'queries': False,
+}
+
+
+def iter_metrics(results: dict, path: str = '') -> Iterator[Tuple[str, str, float]]:
+    for key, value in results.items():
+        if key == 'meta':
+            continue
+        if isinstance(value, dict):
+            yield from iter_metrics(value, '%s / %s' % (path, key) if path else key)
+        elif key in METRICS and isinstance(value, (int, float)):
+            yield path, key, value
+
+
+def compare(old: dict, new: dict, threshold: float) -> bool:
+    """
+        print changes of results
+    :return: True if some result is worse than threshold
+    """
+    old_metrics = {(path, key): value for path, key, value in iter_metrics(old)}
+    has_regressions = False
+    for path, key, value in iter_metrics(new):
+        old_value = old_metrics.get((path, key))
+        if old_value is None:
+            continue
+        if old_value:
+            change = (value - old_value) / old_value
+        else:
+            # baseline of 0 (queries) - any growth is regression
+            change = float('inf') if value != old_value else 0.0
+        worse = -change if METRICS[key] else change
+        mark = ''
+        if worse > threshold:
+            mark = ' REGRESSION'
+            has_regressions = True
+        print('%s [%s]: %s -> %s (%+.1f%%)%s' % (path, key, old_value, value, change * 100, mark))
+    return has_regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args()
+
+    with open(args.old) as old_file, open(args.new) as new_file:
+        regressions = compare(json.load(old_file), json.load(new_file), args.threshold)
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,55 @@
+import datetime
+import decimal
+from typing import List
+
+
+def create_wide_objects(count: int, tags_count: int = 5) -> List:
+    from django.utils import timezone
+    from .bench_app import models
+
+    tags = [models.Tag.objects.create(name='tag %s' % i) for i in range(tags_count)]
+    objects = []
+    for i in range(count):
+        obj = models.Wide.objects.create(
+            char_1='char %s' % i, char_2='value', char_3='value', char_4='value', char_5='value',
+            text_1='text ' * 20, text_2='',
+            int_1=i, int_2=i * 2, int_3=i * 3,
+            float_1=i / 3,
+            decimal_1=decimal.Decimal('10.50'), decimal_2=decimal.Decimal(i),
+            bool_1=True,
+            date_1=datetime.date(2020, 1, 1), datetime_1=timezone.now(), time_1=datetime.time(12, 30),
+            json_1={'key': i, 'nested': {'date': '2020-01-01'}},
+            tag=tags[i % tags_count],
+        )
+        obj.tags.set(tags[:i % tags_count + 1])
+        objects.append(obj)
+    return objects
+
+
+def create_logs(count: int, objects: List, batch_size: int = 10000) -> None:
+    """
+        log records of objects (every record changes two fields of object) and plain records (every 3-th),
+        inserted by batches
+    """
+    from sw_logger import consts
+    from sw_logger import models
+    from sw_logger import serializers
+
+    objects_data = [serializers.model_to_dict(obj) for obj in objects]
+    batch = []
+    for i in range(count):
+        if i % 3 == 0:
+            log = models.Log(message='plain record %s' % i, level=consts.LOG_LEVEL_INFO, func_name='bench')
+        else:
+            obj = objects[i % len(objects)]
+            object_data = dict(objects_data[i % len(objects)], int_2=i, char_2='value %s' % i)
+            log = models.Log(
+                message='object record %s' % i, level=consts.LOG_LEVEL_INFO, func_name='bench',
+                action=consts.ACTION_UPDATED, object_name=obj.LOG_NAME, object_id=obj.id, object_data=object_data,
+            )
+        batch.append(log)
+
+        if len(batch) >= batch_size:
+            models.Log.objects.bulk_create(batch)
+            batch = []
+    models.Log.objects.bulk_create(batch)
@@ -0,0 +1,72 @@
+"""
+    Records per second of DbHandler and QueuedDbHandler (including flush) for plain, request and object records.
+    python -m benchmarks.emit [--number N]
+"""
+import logging
+import argparse
+
+from . import setup, measure, output
+
+
+def make_records() -> dict:
+    from django.contrib.auth.models import User
+    from django.test import RequestFactory
+    from .bench_app import models
+    from .data import create_wide_objects
+
+    create_wide_objects(1)
+    request = RequestFactory().post('/orders/?page=2&sort=name', {'name': 'order', 'items': ['1', '2', '3']})
+    request.user = User.objects.get_or_create(username='bench')[0]
+    obj = models.Wide.objects.prefetch_related('tags').get()
+
+    def make_record(**extra):
+        record = logging.LogRecord('bench', logging.INFO, __file__, 1, 'bench record', None, None)
+        record.__dict__.update(extra)
+        return record
+
+    return {
+        'plain': make_record(),
+        'request': make_record(request=request),
+        'object': make_record(object=obj, action='updated'),
+    }
+
+
+def run(number: int = 1000) -> dict:
+    from django.test import override_settings
+    from sw_logger import handlers
+    from sw_logger import models
+
+    records = make_records()
+    results = {}
+    with override_settings(SW_LOGGER_LOG_REQUEST_PARAMS=True):
+        for name, record in records.items():
+            handler = handlers.DbHandler()
+            results['DbHandler %s' % name] = measure(lambda: handler.handle(record), number)
+
+        for name, record in records.items():
+            handler = handlers.QueuedDbHandler(batch_size=500, flush_interval=0.05, queue_size=number + 1)
+            # records are saved in background: throughput - till all records are saved,
+            # enqueue_per_second - of calling thread only (not compared)
+            enqueue = measure(lambda: handler.handle(record), number)
+            flush_seconds = measure(handler.flush, 1)['seconds']
+            handler.close()
+            seconds = enqueue['seconds'] + flush_seconds
+            results['QueuedDbHandler %s' % name] = {
+                'number': number,
+                'seconds': round(seconds, 4),
+                'per_second': round(number / seconds, 1) if seconds else None,
+                'enqueue_per_second': enqueue['per_second'],
+                'flush_seconds': flush_seconds,
+            }
+
+    results['saved'] = models.Log.objects.count()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup()
+    output(run(args.number))
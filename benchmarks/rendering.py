@@ -0,0 +1,96 @@
+"""
+    Log list rendering by number of log records in table: Log.get_changes and object_display_from_log
+    for page, admin changelist and views.Log (time and db queries).
+    python -m benchmarks.rendering [--rows N [N ...]] [--number N]
+"""
+import argparse
+
+from . import setup, measure, count_queries, output
+
+PER_PAGE = 30
+
+
+def get_page():
+    from sw_logger import models
+    return list(models.Log.objects.order_by('-created', '-id')[:PER_PAGE])
+
+
+def get_prefetched_page():
+    from sw_logger import tools
+    return tools.prefetch_changes(get_page())
+
+
+def get_changes(page):
+    return [log.get_changes() for log in page]
+
+
+def object_display(page):
+    from sw_logger import tools
+    return [tools.object_display_from_log(log) for log in page]
+
+
+def measure_with_queries(func, number: int) -> dict:
+    # first call (templates loading and etc) is not measured
+    queries = count_queries(func)
+    result = measure(func, number)
+    result['queries'] = queries
+    return result
+
+
+def run_rows(rows: int, number: int) -> dict:
+    from django.contrib.auth.models import User
+    from django.test import Client, RequestFactory
+    from sw_logger import models
+    from sw_logger import views
+    from .bench_app import models as bench_models
+    from .data import create_logs
+
+    models.Log.objects.all().delete()
+    create_logs(rows, list(bench_models.Wide.objects.all()))
+
+    client = Client()
+    client.force_login(User.objects.get(username='bench_admin'))
+
+    class LogView(views.Log):
+        template_name = 'bench_log.html'
+
+    request = RequestFactory().get('/log/', {'datetime_from': '2000-01-01 00:00', 'datetime_to': '2100-01-01 00:00'})
+
+    def render_view():
+        response = LogView.as_view()(request)
+        response.render()
+        assert response.status_code == 200
+
+    def render_admin():
+        response = client.get('/admin/sw_logger/log/')
+        assert response.status_code == 200
+
+    return {
+        'get_changes per page': measure_with_queries(lambda: get_changes(get_page()), number),
+        'get_changes per page (prefetched)': measure_with_queries(lambda: get_changes(get_prefetched_page()), number),
+        'object_display_from_log per page': measure_with_queries(lambda: object_display(get_page()), number),
+        'object_display_from_log per page (prefetched)': measure_with_queries(
+            lambda: object_display(get_prefetched_page()), number,
+        ),
+        'admin changelist': measure_with_queries(render_admin, number),
+        'views.Log': measure_with_queries(render_view, number),
+    }
+
+
+def run(rows_list=(10000,), number: int = 10) -> dict:
+    from django.contrib.auth.models import User
+    from .data import create_wide_objects
+
+    User.objects.create_superuser('bench_admin', 'bench@example.com', 'bench')
+    create_wide_objects(20)
+    return {'%s rows' % rows: run_rows(rows, number) for rows in rows_list}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000])
+    parser.add_argument('--number', type=int, default=10)
+    args = parser.parse_args()
+
+    setup()
+    output(run(args.rows, args.number))
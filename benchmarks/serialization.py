@@ -0,0 +1,51 @@
+"""
+    Compare object serialization: tools.model_to_dict + json.dumps (legacy) and serializers engine.
+    python -m benchmarks.serialization [--number N]
+"""
+import json
+import argparse
+
+from . import setup, measure, output
+
+
+def run(number: int = 1000) -> dict:
+    from sw_logger import tools
+    from sw_logger import serializers
+    from .bench_app import models
+    from .data import create_wide_objects
+
+    create_wide_objects(1)
+    obj = models.Wide.objects.get()
+    prefetched_obj = models.Wide.objects.prefetch_related('tags').get()
+    prefetched_obj.tags.all()
+
+    assert json.loads(json.dumps(tools.model_to_dict(obj))) == json.loads(serializers.dumps(serializers.model_to_dict(obj)))
+
+    results = {
+        'legacy model_to_dict + json': measure(lambda: json.dumps(tools.model_to_dict(obj)), number),
+        'serializers.model_to_dict + json': measure(
+            lambda: json.dumps(serializers.model_to_dict(obj)), number,
+        ),
+        'serializers.model_to_dict (prefetched m2m) + json': measure(
+            lambda: json.dumps(serializers.model_to_dict(prefetched_obj)), number,
+        ),
+    }
+
+    for backend in ('orjson', 'msgspec'):
+        dumps = serializers._get_dumps(backend)
+        if dumps is json.dumps:
+            continue
+        results['serializers.model_to_dict (prefetched m2m) + %s' % backend] = measure(
+            lambda: dumps(serializers.model_to_dict(prefetched_obj)), number,
+        )
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup()
+    output(run(args.number))
@@ -0,0 +1,59 @@
+import os
+
+# PostgreSQL: SW_LOGGER_BENCH_DB=postgresql SW_LOGGER_BENCH_DB_NAME=... (and USER, PASSWORD, HOST, PORT)
+if os.environ.get('SW_LOGGER_BENCH_DB') == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('SW_LOGGER_BENCH_DB_NAME', 'sw_logger_bench'),
+            'USER': os.environ.get('SW_LOGGER_BENCH_DB_USER', ''),
+            'PASSWORD': os.environ.get('SW_LOGGER_BENCH_DB_PASSWORD', ''),
+            'HOST': os.environ.get('SW_LOGGER_BENCH_DB_HOST', ''),
+            'PORT': os.environ.get('SW_LOGGER_BENCH_DB_PORT', ''),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            # in-memory db shared by threads (for QueuedDbHandler writer)
+            'NAME': os.environ.get('SW_LOGGER_BENCH_DB_NAME', 'file:sw_logger_bench?mode=memory&cache=shared'),
+        }
+    }
+
+INSTALLED_APPS = [
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.admin',
+    'sw_logger',
+    'benchmarks.bench_app',
+]
+
+MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+]
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+ROOT_URLCONF = 'benchmarks.urls'
+
+SECRET_KEY = "123"
+USE_TZ = True
+DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
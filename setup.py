@@ -13,10 +13,11 @@ setup(
     author_email='sergey@telminov.ru',
     url='https://github.com/telminov/sw-django-logger',
     include_package_data=True,
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     license='The MIT License',
     test_suite='runtests.runtests',
+    python_requires='>=3.7',
     install_requires=[
-        'django', 'django-filter',
+        'django>=3.1', 'django-filter',
     ],
 )
@@ -1 +1,7 @@
-from .exceptions import LoggerException
\ No newline at end of file
+import django
+
+from .exceptions import LoggerException
+
+if django.VERSION < (3, 2):
+    # app config is not detected automatically by Django < 3.2
+    default_app_config = 'sw_logger.apps.SwLoggerConfig'
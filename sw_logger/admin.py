@@ -1,8 +1,17 @@
 from django.contrib import admin
-from django.utils.html import format_html
+from django.contrib.admin.views.main import ChangeList
+from django.utils.html import format_html, format_html_join
 
 from . import consts
 from . import models
+from . import tools
+from . import retention
+from . import paginators
+from . import search
+from . import routers
+from . import history
+
+CURSOR_VAR = 'cursor'
 
 
 class InputFilter(admin.SimpleListFilter):
@@ -45,15 +54,93 @@ class LogMessageFilter(InputFilter):
 
     def queryset(self, request, queryset):
         if self.value() is not None:
-            return queryset.filter(message__icontains=self.value())
+            return search.get_search_backend().search(queryset, self.value())
+
+
+class CursorChangeList(ChangeList):
+    """
+        Change list with "next"/"previous" pages by (created, id) cursor instead of page numbers
+    """
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_results(self, request):
+        count_limit = self.model_admin.count_limit
+        paginator = paginators.CursorPaginator(
+            self.queryset, self.list_per_page, count_limit=count_limit, with_count=count_limit is not None,
+        )
+        page = paginator.page(request.GET.get(CURSOR_VAR))
+
+        self.cursor_page = page
+        self.result_count = page.count if page.count is not None else len(page)
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.full_result_count = None
+        self.result_list = page.object_list
+        self.can_show_all = False
+        self.multi_page = page.has_next() or page.has_previous()
+        self.paginator = paginator
+
+    def get_next_url(self) -> str:
+        return self.get_query_string({CURSOR_VAR: self.cursor_page.next_cursor})
+
+    def get_previous_url(self) -> str:
+        return self.get_query_string({CURSOR_VAR: self.cursor_page.previous_cursor})
 
 
 class Log(admin.ModelAdmin):
     list_display = ('get_message', 'get_action', 'get_obj', 'get_changes', 'get_time', 'get_username', 'get_level')
     list_filter = (LogUsernameFilter, LogObjectIDFilter, LogMessageFilter, 'action', 'level', 'created', 'object_name')
     ordering = ('-created', )
+    paginator = paginators.CappedCountPaginator
+    count_limit = None  # count records up to limit only (pages after limit are not available)
+    cursor_pagination = False  # "next"/"previous" pages by (created, id) cursor instead of page numbers
+
+    def __init__(self, model, admin_site):
+        super().__init__(model, admin_site)
+        # total number of records (without filters) is not counted, "show all" is not available
+        if self.count_limit is not None:
+            self.show_full_result_count = False
+            self.list_max_show_all = 0
+        if self.cursor_pagination and not self.change_list_template:
+            self.change_list_template = 'admin/sw_logger/cursor_change_list.html'
+
+    def get_changelist(self, request, **kwargs):
+        if self.cursor_pagination:
+            return CursorChangeList
+        return super().get_changelist(request, **kwargs)
+
+    def get_sortable_by(self, request):
+        # records of cursor pages are ordered by creation time only
+        if self.cursor_pagination:
+            return ()
+        return super().get_sortable_by(request)
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        return self.paginator(queryset, per_page, orphans, allow_empty_first_page, count_limit=self.count_limit)
+
+    def get_queryset(self, request):
+        qs = retention.filter_actual(super().get_queryset(request))
+        # viewing from read db (replica), changes - from default for log models
+        if request.method in ('GET', 'HEAD'):
+            qs = qs.using(routers.get_read_database())
+        return qs
+
+    def changelist_view(self, request, extra_context=None):
+        response = super().changelist_view(request, extra_context)
+
+        # fetch previous logs for all page rows at once (for "get_changes" column)
+        changelist = getattr(response, 'context_data', {}).get('cl')
+        if changelist:
+            tools.prefetch_changes(changelist.result_list)
+
+        return response
 
     def get_message(self, obj: models.Log):
+        if obj.repeat_count > 1:
+            return f'{obj.message} (x{obj.repeat_count})'
         return obj.message
     get_message.short_description = 'Сообщение'
 
@@ -118,3 +205,42 @@ class Log(admin.ModelAdmin):
         text_html = f'<div style="{css}">{obj.level}</div>'
         return format_html(text_html)
     get_level.short_description = 'Уровень'
+
+
+class ObjectHistoryMixin:
+    """
+        Read-only field with last log records of object for ModelAdmin of logged model
+
+            class Book(ObjectHistoryMixin, admin.ModelAdmin):
+                ...
+    """
+    log_history_size = 20
+
+    def get_readonly_fields(self, request, obj=None):
+        readonly_fields = list(super().get_readonly_fields(request, obj))
+        if obj is not None and 'get_log_history' not in readonly_fields:
+            readonly_fields.append('get_log_history')
+        return readonly_fields
+
+    def get_log_history(self, obj):
+        if obj is None or obj.pk is None:
+            return ''
+
+        page = history.ObjectHistory.for_object(obj, using=routers.get_read_database()) \
+            .page(per_page=self.log_history_size)
+        rows = format_html_join('', '<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td><ul>{}</ul></td></tr>', (
+            (
+                log.created, log.action, log.username, log.message,
+                format_html_join('', '<li><b>{}</b>: {}</li>', (
+                    (field, '' if value is None else value)
+                    for field, value in (log.get_changes() or {}).items()
+                )),
+            )
+            for log in page
+        ))
+        return format_html(
+            '<table><thead><tr><th>Время</th><th>Действие</th><th>Пользователь</th><th>Сообщение</th>'
+            '<th>Изменения</th></tr></thead><tbody>{}</tbody></table>',
+            rows,
+        )
+    get_log_history.short_description = 'История изменений'
@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class SwLoggerConfig(AppConfig):
+    name = 'sw_logger'
+
+    def ready(self):
+        # register system checks
+        from . import checks
+
+        # automatic logging of models changes
+        if getattr(settings, 'SW_LOGGER_AUTO_CAPTURE', False):
+            from . import capture
+            capture.connect()
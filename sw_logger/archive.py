@@ -0,0 +1,249 @@
+import io
+import os
+import csv
+import gzip
+import json
+from typing import Optional, Type, Iterator, List
+from django.core.management.color import no_style
+from django.db import connections, router
+from django.db.models import Model, QuerySet, JSONField
+
+from . import consts
+from . import models
+from . import tools
+from .exceptions import LoggerException
+
+
+def guess_format(path: str) -> str:
+    name = os.path.basename(path).lower()
+    if '.%s' % consts.ARCHIVE_FORMAT_CSV in name:
+        return consts.ARCHIVE_FORMAT_CSV
+    return consts.ARCHIVE_FORMAT_JSONL
+
+
+def guess_compression(path: str) -> Optional[str]:
+    name = path.lower()
+    if name.endswith('.gz'):
+        return consts.COMPRESSION_GZIP
+    if name.endswith('.zst'):
+        return consts.COMPRESSION_ZSTD
+
+
+class ArchiveFile:
+    """
+        text file with optional gzip or zstd (requires "zstandard" package) compression
+    """
+    def __init__(self, path: str, mode: str, compression: Optional[str] = None):
+        assert mode in ('r', 'w')
+        self.raw = open(path, mode + 'b')
+
+        if compression == consts.COMPRESSION_GZIP:
+            stream = gzip.GzipFile(fileobj=self.raw, mode=mode + 'b')
+        elif compression == consts.COMPRESSION_ZSTD:
+            try:
+                import zstandard
+            except ImportError:
+                self.raw.close()
+                raise LoggerException('Install "zstandard" package for zstd compression')
+            if mode == 'w':
+                stream = zstandard.ZstdCompressor().stream_writer(self.raw, closefd=False)
+            else:
+                stream = zstandard.ZstdDecompressor().stream_reader(self.raw, closefd=False)
+        elif compression is None:
+            stream = self.raw
+        else:
+            self.raw.close()
+            raise LoggerException('Unknown compression "%s"' % compression)
+
+        self.stream = stream
+        self.text = io.TextIOWrapper(stream, encoding='utf-8', newline='', write_through=True)
+
+    def sync(self):
+        """
+            flush all written data to disk
+        """
+        self.text.flush()
+        if self.stream is not self.raw:
+            self.stream.flush()
+        self.raw.flush()
+        os.fsync(self.raw.fileno())
+
+    def close(self):
+        self.text.close()
+        if not self.raw.closed:
+            self.raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _get_fields(log_model: Type[Model]) -> List:
+    return list(log_model._meta.concrete_fields)
+
+
+def _to_json(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def _to_csv(field, value) -> str:
+    if value is None:
+        return ''
+    if isinstance(field, JSONField):
+        return json.dumps(value)
+    return _to_json(value)
+
+
+def _from_archive(field, value, archive_format: str = consts.ARCHIVE_FORMAT_JSONL):
+    if archive_format == consts.ARCHIVE_FORMAT_CSV:
+        # CSV values are strings: empty - None, JSON fields are encoded as JSON (see _to_csv)
+        if value == '' and field.null:
+            return None
+        if isinstance(field, JSONField):
+            return json.loads(value)
+
+    return field.to_python(value)
+
+
+def export_logs(path: str, queryset: Optional[QuerySet] = None, archive_format: Optional[str] = None,
+                compression: Optional[str] = None, chunk_size: int = 1000, delete: bool = False) -> int:
+    """
+        write log records to file by chunks (in constant memory), ordered by primary key.
+        Format and compression by default guessed from file name (for example, "log.jsonl.gz", "log.csv.zst").
+    :param delete: delete records of each chunk from db after it written to disk
+    :return: number of exported records
+    """
+    if queryset is None:
+        queryset = models.Log.objects.all()
+    archive_format = archive_format or guess_format(path)
+    if compression is None:
+        compression = guess_compression(path)
+
+    fields = _get_fields(queryset.model)
+    field_names = [field.attname for field in fields]
+    pk_index = field_names.index(queryset.model._meta.pk.attname)
+    queryset = queryset.order_by('pk')
+
+    count = 0
+    with ArchiveFile(path, 'w', compression) as archive:
+        if archive_format == consts.ARCHIVE_FORMAT_CSV:
+            writer = csv.writer(archive.text)
+            writer.writerow(field_names)
+        else:
+            writer = None
+
+        last_pk = None
+        while True:
+            chunk_qs = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            rows = list(chunk_qs.values_list(*field_names)[:chunk_size])
+            if not rows:
+                break
+
+            for row in rows:
+                if writer:
+                    writer.writerow([_to_csv(field, value) for field, value in zip(fields, row)])
+                else:
+                    archive.text.write(json.dumps(dict(zip(field_names, row)), default=_to_json) + '\n')
+
+            last_pk = rows[-1][pk_index]
+            count += len(rows)
+
+            if delete:
+                archive.sync()
+                queryset.model.objects.filter(pk__in=[row[pk_index] for row in rows]).delete()
+
+    return count
+
+
+def read_archive(path: str, log_model: Type[Model] = models.Log, archive_format: Optional[str] = None,
+                 compression: Optional[str] = None) -> Iterator[Model]:
+    """
+        iterate log model instances (not saved) from archive file
+    """
+    archive_format = archive_format or guess_format(path)
+    if compression is None:
+        compression = guess_compression(path)
+
+    fields_by_name = {field.attname: field for field in _get_fields(log_model)}
+
+    with ArchiveFile(path, 'r', compression) as archive:
+        if archive_format == consts.ARCHIVE_FORMAT_CSV:
+            rows = csv.DictReader(archive.text)
+        else:
+            rows = (json.loads(line) for line in archive.text if line.strip())
+
+        for row in rows:
+            yield row_to_log(log_model, row, fields_by_name, archive_format)
+
+
+def log_to_json(log: Model, with_pk: bool = True) -> str:
+    """
+        JSON line (without line break) of log record, as in jsonl archive
+    """
+    row = {
+        field.attname: getattr(log, field.attname)
+        for field in _get_fields(type(log))
+        if with_pk or not field.primary_key
+    }
+    return json.dumps(row, default=_to_json)
+
+
+def row_to_log(log_model: Type[Model], row: dict, fields_by_name: Optional[dict] = None,
+               archive_format: str = consts.ARCHIVE_FORMAT_JSONL) -> Model:
+    """
+        log model instance (not saved) from archive row {field attname: value}
+    """
+    if fields_by_name is None:
+        fields_by_name = {field.attname: field for field in _get_fields(log_model)}
+
+    values = {}
+    for name, value in row.items():
+        field = fields_by_name.get(name)
+        if not field:
+            continue
+        values[name] = _from_archive(field, value, archive_format)
+    return log_model(**values)
+
+
+def import_logs(path: str, log_model: Type[Model] = models.Log, archive_format: Optional[str] = None,
+                compression: Optional[str] = None, batch_size: int = 1000, keep_ids: bool = True) -> int:
+    """
+        load log records from archive file by bulk inserts
+    :param keep_ids: save records with archived ids (records must not exist in db)
+    :return: number of imported records
+    """
+    count = 0
+    logs = []
+    for log in read_archive(path, log_model, archive_format, compression):
+        if not keep_ids:
+            log.pk = None
+            log.id = None
+        logs.append(log)
+
+        if len(logs) >= batch_size:
+            tools.save_logs(logs)
+            count += len(logs)
+            logs = []
+
+    tools.save_logs(logs)
+    count += len(logs)
+
+    if keep_ids and count:
+        _reset_sequences(log_model)
+    return count
+
+
+def _reset_sequences(log_model: Type[Model]) -> None:
+    """
+        set primary key sequences after inserts with explicit ids (PostgreSQL, Oracle)
+    """
+    connection = connections[router.db_for_write(log_model)]
+    statements = connection.ops.sequence_reset_sql(no_style(), [log_model] + list(log_model._meta.parents))
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
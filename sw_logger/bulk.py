@@ -0,0 +1,92 @@
+import sys
+import copy
+import logging
+from typing import Iterable, Iterator, List, Optional
+from django.db.models import Model, QuerySet, prefetch_related_objects
+from django.http import HttpRequest
+
+from . import consts
+from . import tools
+from .handlers import DbHandler
+
+
+def log_objects(objects: Iterable[Model], message: str, action: str = consts.ACTION_OTHER,
+                request: Optional[HttpRequest] = None, level: int = logging.INFO, extra: Optional[dict] = None,
+                handler: Optional[DbHandler] = None, batch_size: int = 1000) -> int:
+    """
+        Log many objects at once. Equivalent of calling for each object
+            logger.info(message, extra={'object': obj, 'action': action, 'request': request, 'extra': extra})
+        but request data processed once, many-to-many values fetched by one query per field for each batch
+        and log records saved by bulk inserts. QuerySet is fetched by batches (not loaded into memory at once).
+        Level and filters of handler are respected, throttling (sampling, rate limits) is not applied.
+
+        :param handler: handler for building log records (use it for customized log model)
+        :return: number of logged objects
+    """
+    handler = handler or DbHandler()
+
+    caller = sys._getframe(1)
+    record = logging.LogRecord(
+        name=__name__, level=level, pathname=caller.f_code.co_filename, lineno=caller.f_lineno,
+        msg=message, args=None, exc_info=None, func=caller.f_code.co_name,
+    )
+    record.action = action
+    if request is not None:
+        record.request = request
+    if extra is not None:
+        record.extra = extra
+
+    # level of handler (for all objects) and its filters (for each object) are respected
+    if record.levelno < handler.level:
+        return 0
+
+    # common for all objects data
+    template_log = handler.make_log(record)
+
+    if isinstance(objects, QuerySet):
+        # objects are fetched by chunks, many-to-many values - for each chunk
+        objects = objects.iterator(chunk_size=batch_size)
+
+    count = 0
+    for chunk in _iter_chunks(objects, batch_size):
+        _prefetch_many_to_many(chunk)
+
+        logs = []
+        for obj in chunk:
+            record.object = obj
+            if not handler.filter(record):
+                continue
+            log = copy.copy(template_log)
+            handler._process_object_data(log, record)
+            handler._emit_extra(log, record)
+            logs.append(log)
+
+        tools.save_logs(logs)
+        count += len(logs)
+
+    return count
+
+
+def _iter_chunks(objects: Iterable[Model], size: int) -> Iterator[List[Model]]:
+    chunk = []
+    for obj in objects:
+        chunk.append(obj)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _prefetch_many_to_many(objects: List[Model]) -> None:
+    """
+        many-to-many values of objects by one query per field (already prefetched values are not fetched)
+    """
+    objects_by_model = {}
+    for obj in objects:
+        objects_by_model.setdefault(type(obj), []).append(obj)
+
+    for model, model_objects in objects_by_model.items():
+        m2m_names = [field.name for field in model._meta.many_to_many]
+        if m2m_names:
+            prefetch_related_objects(model_objects, *m2m_names)
@@ -0,0 +1,238 @@
+import copy
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Optional, List, Type
+from django.conf import settings
+from django.db import connections
+from django.db.models import Model, signals
+
+from . import consts
+from . import context
+from . import tools
+
+SNAPSHOT_ATTR = '_sw_logger_deleted_snapshot'
+
+
+class Change:
+    """
+        Change of object in transaction. Object is serialized on saving (commit), so several
+        saves of object in transaction give one log record with last state.
+    """
+    def __init__(self, model: Type[Model], pk, obj: Optional[Model], action: str):
+        self.model = model
+        self.pk = pk
+        self.obj = obj
+        self.action = action
+        self.request = context.get_request()
+
+    def merge(self, other: 'Change'):
+        if other.obj is not None:
+            self.obj = other.obj
+        if other.action == consts.ACTION_DELETED:
+            self.action = consts.ACTION_DELETED
+        elif self.action == consts.ACTION_DELETED or other.action == consts.ACTION_CREATED:
+            self.action = other.action
+        # created and then updated - created
+
+
+class Batch:
+    """
+        Changes made in one savepoint of transaction. Saved by on_commit callback (batch itself),
+        callback is removed by Django on rollback of savepoint.
+    """
+    def __init__(self, savepoint_ids: tuple):
+        self.savepoint_ids = savepoint_ids
+        self.changes = OrderedDict()
+
+    def __call__(self):
+        save_changes(list(self.changes.values()))
+
+
+# connection -> list of batches of current transaction
+_batches = weakref.WeakKeyDictionary()
+_batches_lock = threading.Lock()
+
+
+def _get_live_batches(connection) -> List[Batch]:
+    """
+        batches with callbacks still registered in connection (callbacks of rolled back savepoints
+        and finished transactions are removed from connection.run_on_commit)
+    """
+    callbacks = {id(item[1]) for item in connection.run_on_commit}
+    with _batches_lock:
+        batches = [batch for batch in _batches.get(connection, []) if id(batch) in callbacks]
+        _batches[connection] = batches
+    return batches
+
+
+def add_change(change: Change, using: str) -> None:
+    connection = connections[using]
+    if not connection.in_atomic_block:
+        save_changes([change])
+        return
+
+    key = (change.model, change.pk)
+    # None - atomic block without savepoint
+    savepoint_ids = tuple(sid for sid in connection.savepoint_ids if sid is not None)
+    batches = _get_live_batches(connection)
+
+    current_batch = None
+    for batch in batches:
+        existing = batch.changes.get(key)
+        if batch.savepoint_ids == savepoint_ids:
+            current_batch = batch
+            if existing:
+                existing.merge(change)
+                return
+        elif existing and change.action == consts.ACTION_UPDATED and existing.obj is change.obj:
+            # state of object is taken on commit, update in nested savepoint changes nothing
+            return
+
+    if current_batch is None:
+        current_batch = Batch(savepoint_ids)
+        with _batches_lock:
+            _batches.setdefault(connection, []).append(current_batch)
+        connection.on_commit(current_batch)
+
+    current_batch.changes[key] = change
+
+
+_handler = None
+
+
+def get_handler():
+    """
+        handler for building log records, class from SW_LOGGER_CAPTURE_HANDLER setting (DbHandler by default)
+    """
+    global _handler
+    if _handler is None:
+        from django.utils.module_loading import import_string
+        handler_path = getattr(settings, 'SW_LOGGER_CAPTURE_HANDLER', 'sw_logger.handlers.DbHandler')
+        _handler = import_string(handler_path)()
+    return _handler
+
+
+def _make_record(change: Change) -> logging.LogRecord:
+    record = logging.LogRecord(
+        name=__name__, level=logging.INFO, pathname=__file__, lineno=0,
+        msg='%s %s' % (change.model._meta.verbose_name, change.action),
+        args=None, exc_info=None, func='save_changes',
+    )
+    record.action = change.action
+    if change.request is not None:
+        record.request = change.request
+    return record
+
+
+def save_changes(changes: List[Change]) -> None:
+    """
+        save log records of changes by bulk insert
+    """
+    if not changes:
+        return
+
+    handler = get_handler()
+    record = None
+    try:
+        # objects changed through reverse many-to-many relation
+        missing = OrderedDict()
+        for change in changes:
+            if change.obj is None:
+                missing.setdefault(change.model, []).append(change.pk)
+        fetched = {
+            (model, obj.pk): obj
+            for model, pks in missing.items()
+            for obj in model._default_manager.filter(pk__in=pks)
+        }
+
+        logs = []
+        for change in changes:
+            obj = change.obj if change.obj is not None else fetched.get((change.model, change.pk))
+            if obj is None:
+                continue
+
+            record = _make_record(change)
+            record.object = obj
+            logs.append(handler.make_log(record))
+
+        tools.save_logs(logs)
+    except Exception:
+        # log records must not break committed transaction of application
+        handler.handleError(record or _make_record(changes[0]))
+
+
+def is_captured(model: Type[Model]) -> bool:
+    """
+        changes of model are logged automatically (by SW_LOGGER_AUTO_CAPTURE setting:
+        True - all models with LOG_NAME, list - LOG_NAMEs of models)
+    """
+    log_name = getattr(model, 'LOG_NAME', None)
+    if not log_name:
+        return False
+
+    auto_capture = getattr(settings, 'SW_LOGGER_AUTO_CAPTURE', False)
+    if auto_capture is True:
+        return True
+    return bool(auto_capture) and log_name in auto_capture
+
+
+def on_post_save(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw or not is_captured(sender):
+        return
+    action = consts.ACTION_CREATED if created else consts.ACTION_UPDATED
+    add_change(Change(sender, instance.pk, instance, action), using)
+
+
+def on_pre_delete(sender, instance, using=None, **kwargs):
+    if not is_captured(sender):
+        return
+
+    # copy of object (primary key of deleted object is set to None) with many-to-many values,
+    # which are deleted with object
+    snapshot = copy.copy(instance)
+    m2m_names = [field.name for field in sender._meta.many_to_many]
+    if m2m_names:
+        snapshot = sender._default_manager.db_manager(using).filter(pk=instance.pk) \
+            .prefetch_related(*m2m_names).first() or snapshot
+    setattr(instance, SNAPSHOT_ATTR, snapshot)
+
+
+def on_post_delete(sender, instance, using=None, **kwargs):
+    if not is_captured(sender):
+        return
+    snapshot = instance.__dict__.pop(SNAPSHOT_ATTR, None) or copy.copy(instance)
+    add_change(Change(sender, snapshot.pk, snapshot, consts.ACTION_DELETED), using)
+
+
+def on_m2m_changed(sender, instance, action, reverse, model, pk_set, using=None, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear') and is_captured(type(instance)):
+            add_change(Change(type(instance), instance.pk, instance, consts.ACTION_UPDATED), using)
+        return
+
+    # instance - related object, pk_set - ids of changed objects of model
+    if not is_captured(model):
+        return
+
+    if action == 'pre_clear':
+        field = next(field for field in model._meta.many_to_many if field.remote_field.through is sender)
+        pk_set = sender._default_manager.db_manager(using) \
+            .filter(**{field.m2m_reverse_field_name(): instance.pk}) \
+            .values_list(field.m2m_field_name(), flat=True)
+    elif action not in ('post_add', 'post_remove'):
+        return
+
+    for pk in pk_set or []:
+        add_change(Change(model, pk, None, consts.ACTION_UPDATED), using)
+
+
+def connect() -> None:
+    """
+        connect signal handlers (on app ready, if SW_LOGGER_AUTO_CAPTURE is set)
+    """
+    signals.post_save.connect(on_post_save, dispatch_uid='sw_logger_post_save')
+    signals.pre_delete.connect(on_pre_delete, dispatch_uid='sw_logger_pre_delete')
+    signals.post_delete.connect(on_post_delete, dispatch_uid='sw_logger_post_delete')
+    signals.m2m_changed.connect(on_m2m_changed, dispatch_uid='sw_logger_m2m_changed')
@@ -0,0 +1,57 @@
+from collections import defaultdict
+from django.conf import settings
+from django.core import checks
+
+
+@checks.register()
+def check_log_names(app_configs, **kwargs):
+    """
+        LOG_NAME must be unique for project
+    """
+    from . import tools
+
+    models_by_log_name = defaultdict(list)
+    for model in tools.get_log_name_models():
+        models_by_log_name[model.LOG_NAME].append(model)
+
+    errors = []
+    for log_name, models in models_by_log_name.items():
+        if len(models) < 2:
+            continue
+        errors.append(checks.Error(
+            'LOG_NAME "%s" used by several models: %s' % (
+                log_name, ', '.join(model._meta.label for model in models)
+            ),
+            hint='Make LOG_NAME attribute unique for project.',
+            obj=models[1],
+            id='sw_logger.E001',
+        ))
+
+    return errors
+
+
+@checks.register()
+def check_database(app_configs, **kwargs):
+    """
+        SW_LOGGER_DATABASE and SW_LOGGER_READ_DATABASE must be in DATABASES and routed by LogRouter
+    """
+    from . import routers
+
+    errors = []
+    for setting_name in ['SW_LOGGER_DATABASE', 'SW_LOGGER_READ_DATABASE']:
+        alias = getattr(settings, setting_name, None)
+        if alias and alias not in settings.DATABASES:
+            errors.append(checks.Error(
+                '%s "%s" is not in DATABASES' % (setting_name, alias),
+                id='sw_logger.E002',
+            ))
+
+    router_path = '%s.%s' % (routers.LogRouter.__module__, routers.LogRouter.__name__)
+    if routers.get_database() and router_path not in settings.DATABASE_ROUTERS:
+        errors.append(checks.Warning(
+            'SW_LOGGER_DATABASE is set, but log models are not routed to it',
+            hint='Add "%s" to DATABASE_ROUTERS.' % router_path,
+            id='sw_logger.W002',
+        ))
+
+    return errors
@@ -23,3 +23,30 @@ LOG_LEVEL_CHOICES = (
     (LOG_LEVEL_DEBUG, LOG_LEVEL_DEBUG),
     (LOG_LEVEL_NOTSET, LOG_LEVEL_NOTSET),
 )
+
+OVERFLOW_BLOCK = 'block'
+OVERFLOW_DROP_OLDEST = 'drop_oldest'
+OVERFLOW_SYNC = 'sync'
+OVERFLOW_CHOICES = (
+    (OVERFLOW_BLOCK, OVERFLOW_BLOCK),
+    (OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_OLDEST),
+    (OVERFLOW_SYNC, OVERFLOW_SYNC),
+)
+
+ARCHIVE_FORMAT_JSONL = 'jsonl'
+ARCHIVE_FORMAT_CSV = 'csv'
+ARCHIVE_FORMAT_CHOICES = (
+    (ARCHIVE_FORMAT_JSONL, ARCHIVE_FORMAT_JSONL),
+    (ARCHIVE_FORMAT_CSV, ARCHIVE_FORMAT_CSV),
+)
+
+COMPRESSION_GZIP = 'gzip'
+COMPRESSION_ZSTD = 'zstd'
+COMPRESSION_CHOICES = (
+    (COMPRESSION_GZIP, COMPRESSION_GZIP),
+    (COMPRESSION_ZSTD, COMPRESSION_ZSTD),
+)
+
+JSON_BACKEND_JSON = 'json'
+JSON_BACKEND_ORJSON = 'orjson'
+JSON_BACKEND_MSGSPEC = 'msgspec'
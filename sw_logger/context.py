@@ -0,0 +1,86 @@
+import contextvars
+from typing import Optional
+from django.conf import settings
+from django.http import HttpRequest, QueryDict
+
+REQUEST_DATA_ATTR = '_sw_logger_request_data'
+
+# current request (set by sw_logger.middleware.request_context_middleware)
+_request = contextvars.ContextVar('sw_logger_request', default=None)
+
+
+def get_request() -> Optional[HttpRequest]:
+    return _request.get()
+
+
+def set_request(request: Optional[HttpRequest]) -> contextvars.Token:
+    """
+    :return: token for reset_request
+    """
+    return _request.set(request)
+
+
+def reset_request(token: contextvars.Token) -> None:
+    _request.reset(token)
+
+
+def query_to_dict(params: QueryDict) -> dict:
+    result = {}
+    for key in params:
+        values = params.getlist(key)
+        if len(values) > 1:
+            result[key] = values
+        else:
+            result[key] = params[key]
+    return result
+
+
+class RequestData:
+    """
+        Request fields of log record
+    """
+    def __init__(self, request: HttpRequest):
+        self.http_method = request.method
+        self.http_path = request.path
+
+        self.http_request_get = None
+        self.http_request_post = None
+        if getattr(settings, 'SW_LOGGER_LOG_REQUEST_PARAMS', False):
+            # internal import for prevent circular import
+            from . import payload
+            self.http_request_get = payload.limit(query_to_dict(request.GET), 'http_request_get')
+            if isinstance(request.POST, QueryDict):
+                self.http_request_post = payload.limit(query_to_dict(request.POST), 'http_request_post')
+
+        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+        if x_forwarded_for:
+            self.http_referrer = x_forwarded_for.split(',')[-1].strip()
+        else:
+            self.http_referrer = request.META.get('REMOTE_ADDR')
+
+        self.user = None
+        self.user_id = None
+        self.username = None
+        self.set_user(getattr(request, 'user', None))
+
+    def set_user(self, user) -> None:
+        self.user = user
+        if user:
+            self.user_id = getattr(user, 'id', None)
+            self.username = getattr(user, 'username', None)
+
+
+def get_request_data(request: HttpRequest) -> RequestData:
+    """
+    :return: request fields of log record, computed once for request
+    """
+    data = getattr(request, REQUEST_DATA_ATTR, None)
+    if data is None:
+        data = RequestData(request)
+        setattr(request, REQUEST_DATA_ATTR, data)
+    else:
+        # user is changed during request (login, logout)
+        user = getattr(request, 'user', None)
+        if user is not data.user:
+            data.set_user(user)
+    return data
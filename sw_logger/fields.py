@@ -0,0 +1,55 @@
+import json
+import zlib
+import base64
+from django.conf import settings
+from django.db import models
+
+from . import serializers
+
+# stored value is JSON string: MARK + COMPRESSED - compressed value, MARK + string - string starting with MARK
+MARK = '\x01'
+COMPRESSED = 'zlib:'
+
+
+class LogJSONField(models.JSONField):
+    """
+        JSON field (JSONB on PostgreSQL). Saved values are serialized by SW_LOGGER_JSON_BACKEND.
+        Values longer than SW_LOGGER_COMPRESS_THRESHOLD (bytes of JSON) are stored compressed (as marked string) -
+        such values are decompressed on loading, but can't be filtered in db. Lookup values are not compressed.
+    """
+    @staticmethod
+    def to_json(value) -> str:
+        """
+        :return: JSON of value as stored in db (serialized once, compressed if it longer than threshold)
+        """
+        # strings starting with mark are escaped, so they are not confused with compressed values
+        if isinstance(value, str) and value.startswith(MARK):
+            return json.dumps(MARK + value)
+
+        data = serializers.dumps(value)
+        threshold = getattr(settings, 'SW_LOGGER_COMPRESS_THRESHOLD', None)
+        if threshold:
+            encoded = data.encode('utf-8')
+            if len(encoded) > threshold:
+                data = json.dumps(MARK + COMPRESSED + base64.b64encode(zlib.compress(encoded)).decode('ascii'))
+        return data
+
+    @staticmethod
+    def decompress(value):
+        """
+        :return: value from stored in db
+        """
+        if isinstance(value, str) and value.startswith(MARK):
+            value = value[len(MARK):]
+            if value.startswith(COMPRESSED):
+                value = json.loads(zlib.decompress(base64.b64decode(value[len(COMPRESSED):])))
+        return value
+
+    def get_db_prep_save(self, value, connection):
+        if value is None or hasattr(value, 'resolve_expression'):
+            return super().get_db_prep_save(value, connection)
+        # JSON string is cast to json (jsonb) column type by db
+        return self.to_json(value)
+
+    def from_db_value(self, value, expression, connection):
+        return self.decompress(super().from_db_value(value, expression, connection))
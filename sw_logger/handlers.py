@@ -1,21 +1,137 @@
-from typing import Type
-import json
-from logging import Handler, LogRecord
+from typing import Type, List, Tuple, Optional, Dict
+import os
+import copy
+import queue
+import asyncio
+import contextvars
+import time
+import uuid
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from logging import Handler, LogRecord, NOTSET
 from django.http import QueryDict
-from django.db.models import Model
+from django.db import close_old_connections
+from django.db.models import Model, F
 from django.conf import settings
+from django.utils import timezone
+
+from . import consts
+from . import snapshots
+from . import serializers
+from . import throttling
+from . import spool
+from . import context
+from . import payload
+from . import metrics
+from .exceptions import LoggerException
 
 
 class DbHandler(Handler):
+    """
+        Options (handler parameters in LOGGING settings):
+            sampling - share of saved records by logger and level, for example {"django.request:WARNING": 0.1}
+            rate_limits - (records per second, burst) by logger and level, for example {"ERROR": (10, 100)}
+            dedup_window - seconds, during which repeats of saved record (same function, message,
+                level and object) are not saved, but counted in its repeat_count
+        Rule keys are "<logger>:<LEVEL>", "<logger>", "<LEVEL>" or "*".
+        Object changes records (action with object) are always saved.
+    """
+    def __init__(self, level=NOTSET, sampling: Optional[Dict[str, float]] = None,
+                 rate_limits: Optional[Dict[str, Tuple[float, float]]] = None, dedup_window: Optional[float] = None):
+        super().__init__(level)
+        self.throttle = throttling.Throttle(sampling, rate_limits) if sampling or rate_limits else None
+        self.dedup = throttling.DedupWindow(dedup_window) if dedup_window else None
+
     @staticmethod
     def get_log_model() -> Type[Model]:
         from . import models
         return models.Log
 
+    def handle(self, record: LogRecord):
+        start_time = metrics.start_emit()
+        result = super().handle(record)
+        metrics.observe_emit(record, start_time)
+        return result
+
     def emit(self, record: LogRecord):
-        # internal import for prevent circular import
-        from . import tools
+        if not self.accept(record):
+            return
+        log = self.make_log(record)
+        self.save_log(log)
+        self.remember(log, record)
+
+    def save_log(self, log):
+        start_time = metrics.start()
+        try:
+            log.save()
+        except Exception:
+            metrics.increment(metrics.ERRORS)
+            raise
+        metrics.observe_stage(metrics.STAGE_WRITE, start_time)
+        metrics.increment(metrics.RECORDS_SAVED)
+
+    def flush(self):
+        self._save_repeats(pop_all=True)
+
+    def handleError(self, record: LogRecord):
+        metrics.increment(metrics.ERRORS)
+        super().handleError(record)
+
+    def accept(self, record: LogRecord) -> bool:
+        """
+            should record be saved (by sampling, rate limits and deduplication)
+        """
+        if self.throttle is None and self.dedup is None:
+            return True
+        if throttling.is_audit_record(record):
+            return True
+
+        if self.dedup:
+            self._save_repeats()
+            if self.dedup.add_repeat(self.dedup.get_key(record), timezone.now()):
+                return False
+
+        if self.throttle and not self.throttle.allow(record):
+            metrics.increment(metrics.RECORDS_DROPPED, reason=metrics.DROPPED_THROTTLED)
+            return False
+        return True
 
+    def remember(self, log, record: LogRecord):
+        """
+            remember saved record for deduplication of its repeats
+        """
+        if self.dedup is None or throttling.is_audit_record(record):
+            return
+        for entry in self.dedup.add(self.dedup.get_key(record), log, record):
+            self._save_entry_repeats(entry)
+
+    def _save_repeats(self, pop_all: bool = False):
+        if self.dedup is None:
+            return
+        for entry in self.dedup.pop_expired(pop_all):
+            self._save_entry_repeats(entry)
+
+    def _save_entry_repeats(self, entry: throttling.DedupEntry):
+        log = entry.log
+        if log.pk is not None:
+            lookup = {'pk': log.pk}
+        else:
+            # bulk insert doesn't set pk on some backends - record is found by values set before insert
+            lookup = {'created': log.created, 'func_name': log.func_name, 'message': log.message, 'level': log.level}
+
+        try:
+            type(log).objects.filter(**lookup).update(
+                repeat_count=F('repeat_count') + entry.repeats,
+                last_seen=entry.last_seen,
+            )
+        except Exception:
+            self.handleError(entry.record)
+
+    def make_log(self, record: LogRecord) -> Model:
+        """
+            Build (but not save) log model instance from record
+        """
         func_name = '%s.%s; line %s' % (record.module, record.funcName, record.lineno)
 
         log = self.get_log_model()(
@@ -24,12 +140,13 @@ class DbHandler(Handler):
             level=record.levelname,
         )
 
+        start_time = metrics.start()
         self._process_request_data(log, record)
+        metrics.observe_stage(metrics.STAGE_REQUEST, start_time)
 
-        if hasattr(record, 'object'):
-            log.object_id = record.object.id
-            log.object_name = record.object.LOG_NAME
-            log.object_data = json.dumps(tools.model_to_dict(record.object))
+        start_time = metrics.start()
+        self._process_object_data(log, record)
+        metrics.observe_stage(metrics.STAGE_SERIALIZE, start_time)
 
         if hasattr(record, 'object_name'):
             log.object_name = record.object_name
@@ -41,11 +158,11 @@ class DbHandler(Handler):
             log.action = record.action
 
         if hasattr(record, 'extra'):
-            log.extra = json.dumps(record.extra)
+            log.extra = payload.limit(record.extra, 'extra')
 
         self._emit_extra(log, record)
 
-        log.save()
+        return log
 
     def _emit_extra(self, log, record: LogRecord):
         """
@@ -54,37 +171,367 @@ class DbHandler(Handler):
         pass
 
     @classmethod
-    def _process_request_data(cls, log, record: LogRecord) -> None:
-        if not hasattr(record, 'request') or not record.request:
+    def _process_object_data(cls, log, record: LogRecord) -> None:
+        # internal import for prevent circular import
+        from . import tools
+
+        if not hasattr(record, 'object'):
             return
 
-        request = record.request
+        log.object_id = record.object.id
+        log.object_name = record.object.LOG_NAME
+        object_data = serializers.model_to_dict(record.object)
 
-        log.http_method = request.method
-        log.http_path = request.path
+        keyframe_interval = getattr(settings, 'SW_LOGGER_KEYFRAME_INTERVAL', None) or 1
+        store_changes = getattr(settings, 'SW_LOGGER_STORE_CHANGES', False)
+        if keyframe_interval <= 1 and not store_changes:
+            log.object_data = object_data
+            return
 
-        if getattr(settings, 'SW_LOGGER_LOG_REQUEST_PARAMS', False):
-            log.http_request_get = json.dumps(cls._query_to_dict(request.GET))
-            if isinstance(request.POST, QueryDict):
-                log.http_request_post = json.dumps(cls._query_to_dict(request.POST))
+        # previous object state: from cache (previous records of process can be still in queue)
+        # or, for first record of object in process, from last record in db
+        cache = snapshots.get_cache()
+        state = cache.get(log.object_name, log.object_id)
+        is_cached = state is not None
+        previous_data, deltas_count, chain = state or (None, 0, '')
+        if state is None and store_changes:
+            previous_data = tools.get_last_object_state(type(log), log.object_name, log.object_id)
 
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            log.http_referrer = x_forwarded_for.split(',')[-1].strip()
+        if previous_data is None:
+            changes = object_data
         else:
-            log.http_referrer = request.META.get('REMOTE_ADDR')
+            changes = tools.get_object_delta(previous_data, object_data)
+
+        if store_changes:
+            log.changes = list(changes.keys())
 
-        if getattr(request, 'user', None):
-            log.user_id = getattr(request.user, 'id', None)
-            log.username = getattr(request.user, 'username', None)
+        # store only changed fields, except every N-th record of object (keyframe).
+        # Delta is computed against data of previous record of this process only (from cache),
+        # last record in db can be older (previous records are still in queue) or written by other process.
+        # Deltas are reconstructed along chain of its keyframe (see tools.reconstruct_object_data)
+        if is_cached and chain and deltas_count + 1 < keyframe_interval:
+            log.object_data = changes
+            log.object_data_delta = True
+            log.object_data_chain = chain
+            cache.set(log.object_name, log.object_id, object_data, deltas_count + 1, chain)
+        else:
+            log.object_data = object_data
+            if keyframe_interval > 1:
+                log.object_data_chain = uuid.uuid4().hex
+            cache.set(log.object_name, log.object_id, object_data, 0, log.object_data_chain)
+
+    @classmethod
+    def _process_request_data(cls, log, record: LogRecord) -> None:
+        # request of record or current request (set by request_context_middleware)
+        request = getattr(record, 'request', None) or context.get_request()
+        if not request:
+            return
+
+        data = context.get_request_data(request)
+
+        log.http_method = data.http_method
+        log.http_path = data.http_path
+
+        if data.http_request_get is not None:
+            log.http_request_get = data.http_request_get
+        if data.http_request_post is not None:
+            log.http_request_post = data.http_request_post
+
+        log.http_referrer = data.http_referrer
+
+        if data.user:
+            log.user_id = data.user_id
+            log.username = data.username
 
     @classmethod
     def _query_to_dict(cls, params: QueryDict) -> dict:
-        result = {}
-        for key in params:
-            values = params.getlist(key)
-            if len(values) > 1:
-                result[key] = values
+        return context.query_to_dict(params)
+
+
+class QueuedDbHandler(DbHandler):
+    """
+        Build log model instances in the calling thread, but save it in background thread by batches.
+
+        Options (handler parameters in LOGGING settings):
+            batch_size - max number of records in one bulk insert
+            flush_interval - max seconds record can wait in queue before insert
+            queue_size - max number of records in queue
+            overflow - what to do with new record if queue is full:
+                "block" - wait for free place in queue,
+                "drop_oldest" - drop oldest record in queue,
+                "sync" - save record in calling thread
+            sampling, rate_limits, dedup_window - as in DbHandler
+    """
+    def __init__(self, level=NOTSET, batch_size: int = 100, flush_interval: float = 1.0,
+                 queue_size: int = 10000, overflow: str = consts.OVERFLOW_BLOCK,
+                 sampling: Optional[Dict[str, float]] = None,
+                 rate_limits: Optional[Dict[str, Tuple[float, float]]] = None, dedup_window: Optional[float] = None):
+        super().__init__(level, sampling, rate_limits, dedup_window)
+
+        if overflow not in dict(consts.OVERFLOW_CHOICES):
+            raise LoggerException('Unknown overflow policy "%s"' % overflow)
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.queue = queue.Queue(maxsize=queue_size)
+        self._writer_thread = None
+        self._writer_lock = threading.Lock()
+
+        # flush queue on interpreter shutdown
+        atexit.register(self.close)
+
+    def emit(self, record: LogRecord):
+        if not self.accept(record):
+            return
+        item = (self.make_log(record), record)
+        self.remember(item[0], record)
+        self._start_writer()
+
+        if self.overflow == consts.OVERFLOW_BLOCK:
+            self.queue.put(item)
+            return
+
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            if self.overflow == consts.OVERFLOW_SYNC:
+                self._write([item])
             else:
-                result[key] = params[key]
-        return result
+                self._drop_oldest()
+                try:
+                    self.queue.put_nowait(item)
+                except queue.Full:
+                    metrics.increment(metrics.RECORDS_DROPPED, reason=metrics.DROPPED_OVERFLOW)
+
+    def flush(self):
+        """
+            Wait while all queued records (and repeats counts) will be saved
+        """
+        self._save_repeats(pop_all=True)
+        if self._writer_thread and self._writer_thread.is_alive():
+            self.queue.join()
+
+    def close(self):
+        # repeats counts are saved by writer after queued records
+        self._save_repeats(pop_all=True)
+        with self._writer_lock:
+            if self._writer_thread and self._writer_thread.is_alive():
+                # None - stop signal for writer
+                self.queue.put(None)
+                self._writer_thread.join()
+            self._writer_thread = None
+        super().close()
+
+    def _start_writer(self):
+        if self._writer_thread and self._writer_thread.is_alive():
+            return
+
+        with self._writer_lock:
+            # thread can be absent after fork in worker process
+            if not self._writer_thread or not self._writer_thread.is_alive():
+                self._writer_thread = threading.Thread(target=self._writer, name='sw_logger_writer', daemon=True)
+                self._writer_thread.start()
+
+    def _save_entry_repeats(self, entry: throttling.DedupEntry):
+        """
+            repeats count is saved by writer after insert of queued record (queue is FIFO)
+        """
+        if threading.current_thread() is self._writer_thread:
+            try:
+                self.queue.put_nowait(entry)
+            except queue.Full:
+                super()._save_entry_repeats(entry)
+            return
+
+        self._start_writer()
+        self.queue.put(entry)
+
+    def _drop_oldest(self):
+        """
+            drop oldest queued log record (repeats counts and stop signal are kept)
+        """
+        with self.queue.mutex:
+            items = self.queue.queue
+            index = next((i for i, item in enumerate(items) if isinstance(item, tuple)), None)
+            if index is None:
+                return
+            del items[index]
+            self.queue.not_full.notify()
+        self.queue.task_done()
+        metrics.increment(metrics.RECORDS_DROPPED, reason=metrics.DROPPED_OVERFLOW)
+
+    def _writer(self):
+        stop = False
+        while not stop:
+            batch = []
+            try:
+                # without records expired repeats are saved every flush_interval
+                item = self.queue.get(timeout=self.flush_interval if self.dedup else None)
+            except queue.Empty:
+                self._save_repeats()
+                continue
+            deadline = time.monotonic() + self.flush_interval
+
+            while True:
+                if item is None:
+                    stop = True
+                    self.queue.task_done()
+                    break
+
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+            if metrics.get_backend().enabled:
+                metrics.set_gauge(metrics.QUEUE_DEPTH, self.queue.qsize())
+            self._write(batch)
+            for _ in batch:
+                self.queue.task_done()
+            self._save_repeats()
+
+    def _write(self, items: list):
+        """
+        :param items: (log, record) tuples and DedupEntry (repeats count of record queued before)
+        """
+        repeats = [item for item in items if isinstance(item, throttling.DedupEntry)]
+        items = [item for item in items if not isinstance(item, throttling.DedupEntry)]
+        if items:
+            self._write_logs(items)
+        for entry in repeats:
+            super()._save_entry_repeats(entry)
+
+    def _write_logs(self, items: List[Tuple[Model, LogRecord]]):
+        # internal import for prevent circular import
+        from . import tools
+
+        start_time = metrics.start()
+        try:
+            close_old_connections()
+            tools.save_logs([log for log, _ in items])
+        except Exception:
+            self.handleError(items[0][1])
+            return
+        metrics.observe_stage(metrics.STAGE_WRITE, start_time)
+        metrics.increment(metrics.RECORDS_SAVED, len(items))
+
+
+class AsyncDbHandler(DbHandler):
+    """
+        Handler for ASGI projects. Records emitted in event loop thread are saved in separate thread
+        (one for handler, records are saved in emit order), so loop is not blocked by db queries.
+        Records emitted outside of event loop are saved as by DbHandler.
+
+        Options - as in DbHandler.
+    """
+    def __init__(self, level=NOTSET, sampling: Optional[Dict[str, float]] = None,
+                 rate_limits: Optional[Dict[str, Tuple[float, float]]] = None, dedup_window: Optional[float] = None):
+        super().__init__(level, sampling, rate_limits, dedup_window)
+        self.executor = None
+        self._executor_pid = None
+        self._executor_closed = False
+
+        # save records on interpreter shutdown
+        atexit.register(self.close)
+
+    def emit(self, record: LogRecord):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            super().emit(record)
+            return
+
+        if self._executor_closed:
+            super().emit(record)
+            return
+
+        if hasattr(record, 'object'):
+            # object can be changed before record processing, keep state on logging
+            record.object = copy.copy(record.object)
+        # context variables (current request) are not copied to executor thread by itself
+        self._get_executor().submit(contextvars.copy_context().run, self._emit_in_thread, record)
+
+    def flush(self):
+        """
+            Wait while all submitted records will be saved
+        """
+        if self._executor_closed or self.executor is None:
+            super().flush()
+            return
+        self._get_executor().submit(super().flush).result()
+
+    def close(self):
+        self._executor_closed = True
+        if self.executor is not None and self._executor_pid == os.getpid():
+            self.executor.shutdown(wait=True)
+        super().flush()
+        super().close()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # executor thread is absent after fork in worker process
+        if self.executor is None or self._executor_pid != os.getpid():
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sw_logger_async')
+            self._executor_pid = os.getpid()
+        return self.executor
+
+    def _emit_in_thread(self, record: LogRecord):
+        try:
+            close_old_connections()
+            super().emit(record)
+        except Exception:
+            self.handleError(record)
+
+
+class SpoolHandler(DbHandler):
+    """
+        Append log records to local spool files (one per process) instead of db.
+        Records are saved to db by bulk inserts with "sw_logger_collect" command.
+        For many worker processes (gunicorn, uWSGI) writing one log table.
+
+        Options (handler parameters in LOGGING settings):
+            directory - spool directory, by default SW_LOGGER_SPOOL_DIR setting
+            segment_size - bytes of spool file before starting new file
+            sampling, rate_limits - as in DbHandler
+    """
+    def __init__(self, level=NOTSET, directory: Optional[str] = None, segment_size: int = 64 * 1024 * 1024,
+                 sampling: Optional[Dict[str, float]] = None,
+                 rate_limits: Optional[Dict[str, Tuple[float, float]]] = None):
+        super().__init__(level, sampling, rate_limits)
+
+        directory = directory or getattr(settings, 'SW_LOGGER_SPOOL_DIR', None)
+        if not directory:
+            raise LoggerException('Set spool directory by "directory" parameter or SW_LOGGER_SPOOL_DIR setting')
+        self.writer = spool.SpoolWriter(directory, segment_size)
+
+    def emit(self, record: LogRecord):
+        # internal import for prevent circular import
+        from . import archive
+
+        if not self.accept(record):
+            return
+        log = self.make_log(record)
+        start_time = metrics.start()
+        self.writer.write(archive.log_to_json(log, with_pk=False))
+        metrics.observe_stage(metrics.STAGE_WRITE, start_time)
+
+    def close(self):
+        self.writer.close()
+        super().close()
+
+    @classmethod
+    def _process_object_data(cls, log, record: LogRecord) -> None:
+        # previous records of object can be not collected yet, so full object data is stored (without delta)
+        if not hasattr(record, 'object'):
+            return
+
+        log.object_id = record.object.id
+        log.object_name = record.object.LOG_NAME
+        log.object_data = serializers.model_to_dict(record.object)
@@ -0,0 +1,137 @@
+import datetime
+from typing import Optional, List, Type
+from django.db.models import Model, QuerySet
+
+from . import models
+from . import tools
+
+
+class HistoryPage:
+    """
+        Log records of object, newest first. Each record has "history_changes" attribute -
+        {field name: value} changed since previous record (all fields for first record).
+    """
+    def __init__(self, object_list: List[models.Log], next_before_id: Optional[int]):
+        self.object_list = object_list
+        self.next_before_id = next_before_id
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_before_id is not None
+
+
+class ObjectHistory:
+    """
+        Log records of one object (by index on object name, object id and log id)
+    """
+    def __init__(self, object_name: str, object_id: int, log_model: Type[Model] = models.Log,
+                 using: Optional[str] = None):
+        self.object_name = object_name
+        self.object_id = object_id
+        self.log_model = log_model
+        self.using = using
+
+    @classmethod
+    def for_object(cls, obj: Model, log_model: Type[Model] = models.Log,
+                   using: Optional[str] = None) -> 'ObjectHistory':
+        return cls(obj.LOG_NAME, obj.id, log_model, using)
+
+    def get_queryset(self) -> QuerySet:
+        return self.log_model.objects.using(self.using).filter(object_name=self.object_name, object_id=self.object_id)
+
+    def get_object(self) -> Optional[Model]:
+        """
+        :return: current object from db (None if deleted)
+        """
+        model = tools.get_model_by_log_name(self.object_name)
+        return model._default_manager.filter(pk=self.object_id).first()
+
+    def page(self, before_id: Optional[int] = None, per_page: int = 30) -> HistoryPage:
+        """
+            page of history by one query: records with id less than before_id (newest first).
+            Full object data and changes of all page records are computed in one pass from oldest to newest.
+        """
+        qs = self.get_queryset().order_by('-id')
+        if before_id is not None:
+            qs = qs.filter(id__lt=before_id)
+
+        # one more record - previous for oldest record of page
+        logs = list(qs[:per_page + 1])
+        previous_log = logs.pop() if len(logs) > per_page else None
+        next_before_id = logs[-1].id if previous_log else None
+
+        self._compute_changes(list(reversed(logs)), previous_log)
+        return HistoryPage(logs, next_before_id)
+
+    def get_log_at(self, moment: datetime.datetime) -> Optional[models.Log]:
+        """
+        :return: last log record of object with data, created not later than moment
+        """
+        return self.get_queryset().filter(created__lte=moment, object_data__isnull=False).order_by('-id').first()
+
+    def get_state_at(self, moment: datetime.datetime) -> Optional[dict]:
+        """
+        :return: object data as of moment (None if object was not logged before moment)
+        """
+        log = self.get_log_at(moment)
+        if log is None:
+            return
+        return log.get_object_data()
+
+    def get_object_at(self, moment: datetime.datetime) -> Optional[Model]:
+        """
+        :return: model object (not saved) with data as of moment
+        """
+        log = self.get_log_at(moment)
+        if log is None:
+            return
+        return tools.object_from_log(log)
+
+    @staticmethod
+    def _compute_changes(logs: List[models.Log], previous_log: Optional[models.Log]) -> None:
+        """
+            set full object data, previous record and changes for logs ordered from oldest to newest,
+            so its methods (get_object_data, get_changes and etc) don't query db
+        """
+        state = None
+        # chain key -> last object data of chain (deltas are applied to data of its chain)
+        chain_states = {}
+        if previous_log is not None and previous_log.object_data is not None:
+            state = previous_log.get_object_data()
+            chain_states[previous_log.object_data_chain] = state
+
+        last_data_log = previous_log
+        for log in logs:
+            log._previous_object_log = last_data_log if log.object_data is not None else None
+            if log.object_data is None:
+                log.history_changes = {}
+                continue
+
+            chain_state = chain_states.get(log.object_data_chain)
+            if log.object_data_delta and chain_state is not None:
+                object_data = dict(chain_state)
+                object_data.update(log.object_data)
+                log._object_data = object_data
+            else:
+                # keyframe or delta of chain started before page (reconstructed by query)
+                object_data = log.get_object_data()
+
+            if state is None:
+                log.history_changes = dict(object_data)
+            else:
+                log.history_changes = tools.get_object_delta(state, object_data)
+
+            state = object_data
+            chain_states[log.object_data_chain] = object_data
+            last_data_log = log
+
+        # FK and many-to-many objects for display by one query per related model
+        all_logs = logs + ([previous_log] if previous_log else [])
+        related_objects = tools.fetch_related_objects(all_logs)
+        for log in all_logs:
+            log._related_objects = related_objects
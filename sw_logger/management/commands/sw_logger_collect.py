@@ -0,0 +1,29 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from sw_logger import spool
+
+
+class Command(BaseCommand):
+    help = 'Save log records from spool files (written by SpoolHandler) to db'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--directory', help='Spool directory, by default SW_LOGGER_SPOOL_DIR setting')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds between checks of spool files')
+        parser.add_argument('--once', action='store_true', help='Collect present records and exit')
+
+    def handle(self, *args, **options):
+        directory = options['directory'] or getattr(settings, 'SW_LOGGER_SPOOL_DIR', None)
+        if not directory:
+            raise CommandError('Set --directory or SW_LOGGER_SPOOL_DIR setting')
+
+        while True:
+            saved, skipped = spool.collect(directory, batch_size=options['batch_size'])
+            if saved or skipped:
+                self.stdout.write('Saved %s log records, skipped %s broken lines' % (saved, skipped))
+            if options['once']:
+                break
+            if not saved:
+                time.sleep(options['interval'])
@@ -0,0 +1,61 @@
+import time
+import datetime
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from sw_logger import consts
+from sw_logger import models
+
+
+class Command(BaseCommand):
+    help = 'Show query plans and timings of typical log queries (previous object log, admin and view filters)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=10, help='Number of runs for timing each query')
+        parser.add_argument('--analyze', action='store_true', help='EXPLAIN ANALYZE (PostgreSQL)')
+
+    def handle(self, *args, **options):
+        for name, qs in self.get_query_shapes():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(str(qs.query))
+
+            if options['analyze']:
+                plan = qs.explain(analyze=True)
+            else:
+                plan = qs.explain()
+            self.stdout.write(plan)
+
+            started = time.perf_counter()
+            for _ in range(options['repeat']):
+                list(qs.all())
+            duration = (time.perf_counter() - started) / options['repeat']
+            self.stdout.write('avg time: %.2f ms\n\n' % (duration * 1000))
+
+    @staticmethod
+    def get_query_shapes():
+        log_qs = models.Log.objects.all()
+
+        # parameters from last object log, so planner sees real values
+        sample = log_qs.exclude(object_name='').order_by('-id').first() or models.Log(
+            id=0, object_name='', object_id=0, level=consts.LOG_LEVEL_INFO, created=timezone.now()
+        )
+        created_to = sample.created or timezone.now()
+        created_from = created_to - datetime.timedelta(days=1)
+
+        return [
+            ('previous object log', log_qs.filter(
+                object_name=sample.object_name, object_id=sample.object_id, id__lt=sample.id,
+            ).order_by('-id')[:1]),
+            ('admin list', log_qs.order_by('-created')[:100]),
+            ('admin list filtered by level', log_qs.filter(level=sample.level).order_by('-created')[:100]),
+            ('admin list filtered by action', log_qs.filter(
+                action=consts.ACTION_UPDATED,
+            ).order_by('-created')[:100]),
+            ('admin list filtered by object name', log_qs.filter(
+                object_name=sample.object_name,
+            ).order_by('-created')[:100]),
+            ('log view filter', log_qs.filter(
+                created__gte=created_from, created__lte=created_to,
+                level__in=[sample.level], object_name__in=[sample.object_name],
+            )[:30]),
+        ]
@@ -0,0 +1,57 @@
+import datetime
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime, parse_date
+
+from sw_logger import archive
+from sw_logger import consts
+from sw_logger import models
+from sw_logger import retention
+
+
+class Command(BaseCommand):
+    help = 'Write log records to (compressed) JSON Lines or CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Archive file, for example "log.jsonl.gz" or "log.csv.zst"')
+        parser.add_argument('--before', help='Export records created before date (time)')
+        parser.add_argument('--expired', action='store_true', help='Export records older than SW_LOGGER_RETENTION')
+        parser.add_argument('--format', choices=dict(consts.ARCHIVE_FORMAT_CHOICES).keys())
+        parser.add_argument('--compression', choices=dict(consts.COMPRESSION_CHOICES).keys())
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--delete', action='store_true', help='Delete exported records')
+
+    def handle(self, *args, **options):
+        qs = models.Log.objects.all()
+
+        if options['before']:
+            qs = qs.filter(created__lt=self.parse_before(options['before']))
+
+        if options['expired']:
+            expiration_date = retention.get_expiration_date()
+            if not expiration_date:
+                raise CommandError('SW_LOGGER_RETENTION is not set')
+            qs = qs.filter(created__lt=expiration_date)
+
+        count = archive.export_logs(
+            options['path'], qs,
+            archive_format=options['format'],
+            compression=options['compression'],
+            chunk_size=options['chunk_size'],
+            delete=options['delete'],
+        )
+        self.stdout.write('Exported %s log records' % count)
+
+    @staticmethod
+    def parse_before(value: str) -> datetime.datetime:
+        before = parse_datetime(value)
+        if not before:
+            date = parse_date(value)
+            if not date:
+                raise CommandError('Wrong date "%s"' % value)
+            before = datetime.datetime.combine(date, datetime.time.min)
+
+        if settings.USE_TZ and timezone.is_naive(before):
+            before = timezone.make_aware(before)
+        return before
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from sw_logger import archive
+from sw_logger import consts
+
+
+class Command(BaseCommand):
+    help = 'Load log records from archive file, written by sw_logger_export'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=dict(consts.ARCHIVE_FORMAT_CHOICES).keys())
+        parser.add_argument('--compression', choices=dict(consts.COMPRESSION_CHOICES).keys())
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--new-ids', action='store_true', help='Do not keep archived ids')
+
+    def handle(self, *args, **options):
+        count = archive.import_logs(
+            options['path'],
+            archive_format=options['format'],
+            compression=options['compression'],
+            batch_size=options['batch_size'],
+            keep_ids=not options['new_ids'],
+        )
+        self.stdout.write('Imported %s log records' % count)
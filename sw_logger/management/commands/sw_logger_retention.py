@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from sw_logger import models
+from sw_logger import retention
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming log partitions and remove log records older than SW_LOGGER_RETENTION'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=2, help='Create partitions for next months')
+        parser.add_argument('--archive', action='store_true', help='Detach expired partitions instead of drop')
+        parser.add_argument('--batch-size', type=int, default=10000,
+                            help='Delete batch size for not partitioned table')
+
+    def handle(self, *args, **options):
+        log_model = models.Log
+
+        if retention.is_partitioned(log_model):
+            for partition in retention.create_partitions(log_model, months_ahead=options['months_ahead']):
+                self.stdout.write('Created partition %s' % partition)
+            for partition in retention.drop_expired_partitions(log_model, archive=options['archive']):
+                self.stdout.write('%s partition %s' % ('Detached' if options['archive'] else 'Dropped', partition))
+            return
+
+        if retention.get_retention() is None:
+            self.stdout.write('SW_LOGGER_RETENTION is not set, nothing to purge')
+            return
+
+        deleted = retention.purge_expired(log_model, batch_size=options['batch_size'])
+        self.stdout.write('Deleted %s expired log records' % deleted)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from sw_logger import models
+from sw_logger import stats
+
+
+class Command(BaseCommand):
+    help = 'Add numbers of new log records to statistics (LogStat)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100000, help='Log records in one transaction')
+
+    def handle(self, *args, **options):
+        count = stats.rollup(models.Log, batch_size=options['batch_size'])
+        self.stdout.write('Processed %s log records' % count)
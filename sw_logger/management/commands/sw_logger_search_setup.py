@@ -0,0 +1,18 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from sw_logger import models
+from sw_logger import search
+
+
+class Command(BaseCommand):
+    help = 'Create db structures (indexes, tables) for SW_LOGGER_SEARCH_BACKEND'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', help='Customized log model, for example "core.Log"')
+
+    def handle(self, *args, **options):
+        log_model = apps.get_model(options['model']) if options['model'] else models.Log
+        backend = search.get_search_backend()
+        backend.setup(log_model)
+        self.stdout.write('Search is set up for %s' % type(backend).__name__)
@@ -0,0 +1,193 @@
+import time
+import logging
+import threading
+from collections import defaultdict
+from typing import Optional, Dict, Tuple
+from django.conf import settings
+
+from . import payload
+
+PREFIX = 'sw_logger_'
+SLOW_LOGGER_NAME = 'sw_logger.slow'
+
+# stages of log record processing
+STAGE_EMIT = 'emit'
+STAGE_REQUEST = 'request'
+STAGE_SERIALIZE = 'serialize'
+STAGE_WRITE = 'write'
+
+# metric names
+STAGE_SECONDS = 'stage_seconds'
+RECORDS_SAVED = 'records_saved_total'
+RECORDS_DROPPED = 'records_dropped_total'
+ERRORS = 'errors_total'
+QUEUE_DEPTH = 'queue_depth'
+PAYLOAD_TRUNCATED = 'payload_truncated_total'
+
+# reasons of dropped records
+DROPPED_THROTTLED = 'throttled'
+DROPPED_OVERFLOW = 'overflow'
+
+
+class NullMetrics:
+    """
+        No-op metrics backend (default). Base class for custom backends (statsd and etc).
+    """
+    enabled = False
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        pass
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        pass
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        pass
+
+    def export(self) -> str:
+        """
+        :return: metrics in Prometheus text format
+        """
+        return ''
+
+
+class PrometheusMetrics(NullMetrics):
+    """
+        Metrics of process in memory, exported in Prometheus text format by sw_logger.views.Metrics.
+        With several worker processes each process has own metrics.
+    """
+    enabled = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)
+        # (count, sum)
+        self._summaries = defaultdict(lambda: [0, 0.0])
+        self._gauges = {}
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            summary = self._summaries[key]
+            summary[0] += 1
+            summary[1] += value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = value
+
+    def export(self) -> str:
+        with self._lock:
+            counters = dict(self._counters)
+            summaries = {key: tuple(value) for key, value in self._summaries.items()}
+            gauges = dict(self._gauges)
+        return format_metrics(counters, summaries, gauges)
+
+
+def _format_labels(labels: Tuple[Tuple[str, object], ...]) -> str:
+    if not labels:
+        return ''
+    values = (
+        '%s="%s"' % (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels
+    )
+    return '{%s}' % ','.join(values)
+
+
+def format_metrics(counters: Dict[tuple, float], summaries: Optional[Dict[tuple, tuple]] = None,
+                   gauges: Optional[Dict[tuple, float]] = None) -> str:
+    """
+        Prometheus text format of metrics {(name, ((label, value), ...)): value}
+    """
+    lines = []
+    for kind, metrics in (('counter', counters), ('summary', summaries or {}), ('gauge', gauges or {})):
+        last_name = None
+        for (name, labels), value in sorted(metrics.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+            if name != last_name:
+                lines.append('# TYPE %s%s %s' % (PREFIX, name, kind))
+                last_name = name
+            if kind == 'summary':
+                lines.append('%s%s_count%s %s' % (PREFIX, name, _format_labels(labels), value[0]))
+                lines.append('%s%s_sum%s %s' % (PREFIX, name, _format_labels(labels), value[1]))
+            else:
+                lines.append('%s%s%s %s' % (PREFIX, name, _format_labels(labels), value))
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+_backend = None
+
+
+def get_backend() -> NullMetrics:
+    """
+        metrics backend, class from SW_LOGGER_METRICS_BACKEND setting (NullMetrics by default)
+    """
+    global _backend
+    if _backend is None:
+        from django.utils.module_loading import import_string
+        backend_path = getattr(settings, 'SW_LOGGER_METRICS_BACKEND', 'sw_logger.metrics.NullMetrics')
+        _backend = import_string(backend_path)()
+    return _backend
+
+
+def increment(name: str, value: float = 1, **labels) -> None:
+    get_backend().increment(name, value, **labels)
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    get_backend().set_gauge(name, value, **labels)
+
+
+def start() -> Optional[float]:
+    """
+    :return: start time of stage, None - metrics are disabled
+    """
+    return time.perf_counter() if get_backend().enabled else None
+
+
+def observe_stage(stage: str, start_time: Optional[float]) -> None:
+    if start_time is not None:
+        get_backend().observe(STAGE_SECONDS, time.perf_counter() - start_time, stage=stage)
+
+
+def start_emit() -> Optional[float]:
+    """
+    :return: start time of emit, None - metrics are disabled and slow emits are not logged
+    """
+    if get_backend().enabled or getattr(settings, 'SW_LOGGER_SLOW_EMIT_THRESHOLD', None):
+        return time.perf_counter()
+
+
+def observe_emit(record: logging.LogRecord, start_time: Optional[float]) -> None:
+    """
+        time of emit and warning (by "sw_logger.slow" logger) if it longer than SW_LOGGER_SLOW_EMIT_THRESHOLD seconds
+    """
+    if start_time is None:
+        return
+
+    elapsed = time.perf_counter() - start_time
+    get_backend().observe(STAGE_SECONDS, elapsed, stage=STAGE_EMIT)
+
+    threshold = getattr(settings, 'SW_LOGGER_SLOW_EMIT_THRESHOLD', None)
+    # records of slow logger are not checked (its handler can be slow too)
+    if threshold and elapsed > threshold and record.name != SLOW_LOGGER_NAME:
+        logging.getLogger(SLOW_LOGGER_NAME).warning(
+            'Slow emit of log record: %.3f s (logger "%s", %s:%s)',
+            elapsed, record.name, record.module, record.lineno,
+        )
+
+
+def export() -> str:
+    """
+    :return: metrics of backend and payload truncation counters in Prometheus text format
+    """
+    truncated = {
+        (PAYLOAD_TRUNCATED, (('field', field_name), ('reason', reason))): count
+        for (field_name, reason), count in payload.get_counters().items()
+    }
+    return get_backend().export() + format_metrics(truncated)
@@ -0,0 +1,27 @@
+import asyncio
+from django.utils.decorators import sync_and_async_middleware
+
+from . import context
+
+
+@sync_and_async_middleware
+def request_context_middleware(get_response):
+    """
+        Make current request available for log records (sw_logger.context.get_request)
+    """
+    if asyncio.iscoroutinefunction(get_response):
+        async def middleware(request):
+            token = context.set_request(request)
+            try:
+                return await get_response(request)
+            finally:
+                context.reset_request(token)
+    else:
+        def middleware(request):
+            token = context.set_request(request)
+            try:
+                return get_response(request)
+            finally:
+                context.reset_request(token)
+
+    return middleware
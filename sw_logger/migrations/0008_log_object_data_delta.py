@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sw_logger', '0007_log_created_default'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='log',
+            name='object_data_delta',
+            field=models.BooleanField(default=False),
+        ),
+    ]
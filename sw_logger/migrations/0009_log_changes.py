@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sw_logger', '0008_log_object_data_delta'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='log',
+            name='changes',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
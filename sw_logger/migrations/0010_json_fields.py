@@ -0,0 +1,115 @@
+import json
+from django.db import migrations, transaction
+import sw_logger.fields
+
+JSON_FIELDS = ['http_request_get', 'http_request_post', 'object_data', 'changes', 'extra']
+# text fields before migration, which allowed NULL
+NULL_TEXT_FIELDS = ['changes']
+BATCH_SIZE = 5000
+
+
+def _parse(name, value):
+    if value is None or value == '':
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        # not JSON text (for example, extra of old versions) - keep as string
+        return value
+
+
+def _dump(name, value):
+    if value is None:
+        return None if name in NULL_TEXT_FIELDS else ''
+    return json.dumps(value)
+
+
+def _convert(apps, schema_editor, source_suffix, target_suffix, converter):
+    """
+        copy values between text and JSON columns by batches (each batch in own transaction)
+    """
+    Log = apps.get_model('sw_logger', 'Log')
+    db_alias = schema_editor.connection.alias
+    source_fields = [name + source_suffix for name in JSON_FIELDS]
+    target_fields = [name + target_suffix for name in JSON_FIELDS]
+
+    last_id = 0
+    while True:
+        rows = list(
+            Log.objects.using(db_alias).filter(id__gt=last_id).order_by('id')
+            .values_list('id', *source_fields)[:BATCH_SIZE]
+        )
+        if not rows:
+            break
+
+        logs = []
+        for row in rows:
+            log = Log(id=row[0])
+            for name, target_field, value in zip(JSON_FIELDS, target_fields, row[1:]):
+                setattr(log, target_field, converter(name, value))
+            logs.append(log)
+
+        with transaction.atomic(using=db_alias):
+            Log.objects.using(db_alias).bulk_update(logs, target_fields)
+        last_id = rows[-1][0]
+
+
+def text_to_json(apps, schema_editor):
+    _convert(apps, schema_editor, '', '_json', _parse)
+
+
+def json_to_text(apps, schema_editor):
+    _convert(apps, schema_editor, '_json', '', _dump)
+
+
+def create_gin_indexes(apps, schema_editor):
+    # for filtering by JSON content, for example Log.objects.filter(extra__contains={'order_id': 1})
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for field_name in ['extra', 'object_data']:
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS sw_log_%s_gin_idx ON sw_logger_log USING gin (%s jsonb_path_ops)'
+            % (field_name, field_name)
+        )
+
+
+def drop_gin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for field_name in ['extra', 'object_data']:
+        schema_editor.execute('DROP INDEX IF EXISTS sw_log_%s_gin_idx' % field_name)
+
+
+class Migration(migrations.Migration):
+    # each batch of data conversion commits separately
+    atomic = False
+
+    dependencies = [
+        ('sw_logger', '0009_log_changes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='log',
+            name=name + '_json',
+            field=sw_logger.fields.LogJSONField(null=True, blank=True),
+        )
+        for name in JSON_FIELDS
+    ] + [
+        migrations.RunPython(text_to_json, json_to_text),
+    ] + [
+        migrations.RemoveField(
+            model_name='log',
+            name=name,
+        )
+        for name in JSON_FIELDS
+    ] + [
+        migrations.RenameField(
+            model_name='log',
+            old_name=name + '_json',
+            new_name=name,
+        )
+        for name in JSON_FIELDS
+    ] + [
+        migrations.RunPython(create_gin_indexes, drop_gin_indexes),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sw_logger', '0010_json_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='log',
+            name='last_seen',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='log',
+            name='repeat_count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
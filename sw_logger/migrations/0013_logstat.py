@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sw_logger', '0012_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LogStat',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField(db_index=True)),
+                ('level', models.CharField(max_length=10)),
+                ('action', models.CharField(blank=True, max_length=10)),
+                ('object_name', models.CharField(blank=True, max_length=255)),
+                ('user_id', models.IntegerField(null=True)),
+                ('username', models.CharField(blank=True, max_length=255)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['level', 'bucket'], name='sw_logstat_level_idx'), models.Index(fields=['object_name', 'bucket'], name='sw_logstat_objname_idx'), models.Index(fields=['user_id', 'bucket'], name='sw_logstat_user_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sw_logger', '0013_logstat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='log',
+            name='object_data_chain',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+    ]
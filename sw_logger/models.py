@@ -1,9 +1,24 @@
-import json
 import pprint
 from typing import Optional
 from django.db import models
+from django.db.models import OuterRef, Subquery
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from . import consts
+from .fields import LogJSONField
+
+
+class LogQuerySet(models.QuerySet):
+    def with_previous(self) -> 'LogQuerySet':
+        """
+        annotate "previous_object_log_id" - id of previous log record for same object
+        """
+        previous_qs = self.model.objects.filter(
+            object_name=OuterRef('object_name'),
+            object_id=OuterRef('object_id'),
+            id__lt=OuterRef('id'),
+        ).order_by('-id').values('id')[:1]
+        return self.annotate(previous_object_log_id=Subquery(previous_qs))
 
 
 class Log(models.Model):
@@ -17,8 +32,8 @@ class Log(models.Model):
 
     http_path = models.TextField(blank=True)
     http_method = models.TextField(blank=True)
-    http_request_get = models.TextField(blank=True)
-    http_request_post = models.TextField(blank=True)
+    http_request_get = LogJSONField(null=True, blank=True)
+    http_request_post = LogJSONField(null=True, blank=True)
     http_referrer = models.CharField(max_length=255, blank=True)
 
     user_id = models.IntegerField(db_index=True, null=True)
@@ -27,13 +42,33 @@ class Log(models.Model):
     object_name = models.CharField(max_length=255, db_index=True, blank=True)
     object_id = models.IntegerField(db_index=True, null=True)
     fk_object_id = models.IntegerField(db_index=True, null=True)
-    object_data = models.TextField(blank=True)
-
-    extra = models.TextField(blank=True)
-    created = models.DateTimeField(auto_now_add=True, db_index=True)
+    object_data = LogJSONField(null=True, blank=True)
+    # object_data contains only fields changed since previous log of object (see SW_LOGGER_KEYFRAME_INTERVAL)
+    object_data_delta = models.BooleanField(default=False)
+    # key of keyframe and its deltas (written by one process), deltas are applied along chain of its keyframe
+    object_data_chain = models.CharField(max_length=32, blank=True, default='')
+    # names of fields changed since previous log of object (see SW_LOGGER_STORE_CHANGES), null - not computed
+    changes = LogJSONField(null=True, blank=True)
+
+    extra = LogJSONField(null=True, blank=True)
+    # not auto_now_add - for saving records created earlier (queued, archived)
+    created = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
+    # number of same records (see dedup_window of DbHandler), created - time of first, last_seen - of last
+    repeat_count = models.PositiveIntegerField(default=1)
+    last_seen = models.DateTimeField(null=True, blank=True)
+
+    objects = LogQuerySet.as_manager()
 
     class Meta:
         ordering = ('id', )
+        indexes = [
+            # previous log of object, object history
+            models.Index(fields=['object_name', 'object_id', 'id'], name='sw_log_object_history_idx'),
+            # admin and log view filters ordered by time
+            models.Index(fields=['level', '-created'], name='sw_log_level_created_idx'),
+            models.Index(fields=['action', '-created'], name='sw_log_action_created_idx'),
+            models.Index(fields=['object_name', '-created'], name='sw_log_objname_created_idx'),
+        ]
 
     def get_model_object(self) -> models.Model:
         from . import tools
@@ -52,14 +87,29 @@ class Log(models.Model):
         return name
 
     def get_object_data(self) -> Optional[dict]:
-        if not self.object_data:
+        """
+        :return: full object data (for delta record - reconstructed from previous records)
+        """
+        from . import tools
+
+        if self.object_data is None:
             return
 
-        return json.loads(self.object_data)
+        if not self.object_data_delta:
+            return self.object_data
+
+        if not hasattr(self, '_object_data'):
+            self._object_data = tools.reconstruct_object_data(self)
+
+        return self._object_data
 
     def get_object_data_display(self) -> Optional[dict]:
         from . import tools
-        return tools.object_display_from_log(self)
+
+        if not hasattr(self, '_object_data_display'):
+            self._object_data_display = tools.object_display_from_log(self)
+
+        return self._object_data_display
 
     def get_user(self):
         if not self.user_id:
@@ -72,20 +122,25 @@ class Log(models.Model):
         """
         :return: previous log record for same object (same object_name and object_id)
         """
-        if not self.object_data:
+        if self.object_data is None:
             return
 
-        previous_qs = self._meta.model.objects.filter(
-            id__lt=self.id,
-            object_name=self.object_name,
-            object_id=self.object_id,
-        )
-        if previous_qs:
-            return previous_qs.last()
+        # can be prefetched for list of logs by tools.prefetch_changes
+        if not hasattr(self, '_previous_object_log'):
+            self._previous_object_log = self._meta.model.objects.using(self._state.db).filter(
+                id__lt=self.id,
+                object_name=self.object_name,
+                object_id=self.object_id,
+            ).order_by('id').last()
+
+        return self._previous_object_log
 
     def get_changes(self) -> Optional[dict]:
         from . import tools
 
+        if self.changes is not None:
+            return tools.stored_changes_display(self)
+
         previous_object_log = self.get_previous_object_log()
         if not previous_object_log:
             return self.get_object_data_display()
@@ -94,15 +149,9 @@ class Log(models.Model):
 
     def get_extra_data(self):
         """
-        try parse json from extra-field
+        extra-field data
         """
-        if not self.extra:
-            return
-
-        try:
-            return json.loads(self.extra)
-        except Exception:
-            pass
+        return self.extra
 
     def get_extra_pretty(self):
         """
@@ -116,26 +165,52 @@ class Log(models.Model):
 
     def get_http_request_get_pretty(self):
         """
-        pretty output extra-field data
+        pretty output request GET-parameters
         """
         if not self.http_request_get:
             return
 
-        request_data = json.loads(self.http_request_get)
-        if not request_data:
-            return
-
-        return pprint.pformat(request_data)
+        return pprint.pformat(self.http_request_get)
 
     def get_http_request_post_pretty(self):
         """
-        pretty output extra-field data
+        pretty output request POST-parameters
         """
         if not self.http_request_post:
             return
 
-        request_data = json.loads(self.http_request_post)
-        if not request_data:
-            return
+        return pprint.pformat(self.http_request_post)
+
+
+class Checkpoint(models.Model):
+    """
+        Position of background processing (spool file offset, last processed log id),
+        updated in same transaction as processed data
+    """
+    name = models.CharField(max_length=255, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return '%s: %s' % (self.name, self.value)
 
-        return pprint.pformat(request_data)
+
+class LogStat(models.Model):
+    """
+        Number of log records by hour, level, action, object name and user.
+        Updated by "sw_logger_rollup" command, see sw_logger.stats
+    """
+    bucket = models.DateTimeField(db_index=True)
+    level = models.CharField(max_length=10)
+    action = models.CharField(max_length=10, blank=True)
+    object_name = models.CharField(max_length=255, blank=True)
+    user_id = models.IntegerField(null=True)
+    username = models.CharField(max_length=255, blank=True)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['level', 'bucket'], name='sw_logstat_level_idx'),
+            models.Index(fields=['object_name', 'bucket'], name='sw_logstat_objname_idx'),
+            models.Index(fields=['user_id', 'bucket'], name='sw_logstat_user_idx'),
+        ]
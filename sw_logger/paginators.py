@@ -0,0 +1,179 @@
+import base64
+import datetime
+from typing import Optional
+from django.core.paginator import Paginator
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+
+
+def capped_count(qs: QuerySet, limit: Optional[int]) -> int:
+    """
+    :return: number of records, but not more than limit + 1 (so count > limit means "more than limit")
+    """
+    if limit is None:
+        return qs.count()
+    return qs.order_by()[:limit + 1].count()
+
+
+async def acapped_count(qs: QuerySet, limit: Optional[int]) -> int:
+    """
+        async version of capped_count (Django >= 4.1)
+    """
+    if limit is None:
+        return await qs.acount()
+    return await qs.order_by()[:limit + 1].acount()
+
+
+class CappedCountPaginator(Paginator):
+    """
+        Paginator counting records up to count_limit only. Pages after limit are not available.
+    """
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True, count_limit=None):
+        super().__init__(object_list, per_page, orphans, allow_empty_first_page)
+        self.count_limit = count_limit
+
+    @cached_property
+    def count(self):
+        if self.count_limit is None or not isinstance(self.object_list, QuerySet):
+            return super().count
+        return min(capped_count(self.object_list, self.count_limit), self.count_limit)
+
+    async def apage(self, number):
+        """
+            async version of page (for queryset object_list, Django >= 4.1)
+        """
+        if 'count' not in self.__dict__:
+            count = await acapped_count(self.object_list, self.count_limit)
+            if self.count_limit is not None:
+                count = min(count, self.count_limit)
+            # cached_property value
+            self.__dict__['count'] = count
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top = self.count
+        object_list = [obj async for obj in self.object_list[bottom:top]]
+        return self._get_page(object_list, number, self)
+
+
+def encode_cursor(direction: str, created: datetime.datetime, pk: int) -> str:
+    value = '%s|%s|%s' % (direction, created.isoformat(), pk)
+    return base64.urlsafe_b64encode(value.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Optional[tuple]:
+    """
+    :return: (direction, created, pk) or None for wrong cursor
+    """
+    try:
+        direction, created, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        created = parse_datetime(created)
+        pk = int(pk)
+    except (ValueError, UnicodeError):
+        return
+
+    if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS) or not created:
+        return
+    return direction, created, pk
+
+
+class CursorPage:
+    """
+        Page of records ordered by newest first ("-created", "-pk").
+        Instead of page numbers has cursors (tokens) of next and previous pages,
+        so db don't count and skip records before page.
+    """
+    def __init__(self, object_list: list, next_cursor: Optional[str], previous_cursor: Optional[str],
+                 count: Optional[int] = None, count_limit: Optional[int] = None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+        self.count_limit = count_limit
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def is_count_capped(self) -> bool:
+        return self.count is not None and self.count_limit is not None and self.count > self.count_limit
+
+
+class CursorPaginator:
+    def __init__(self, queryset: QuerySet, per_page: int, count_limit: Optional[int] = None,
+                 with_count: bool = False):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.count_limit = count_limit
+        self.with_count = with_count
+
+    def page(self, cursor: Optional[str] = None) -> CursorPage:
+        position = decode_cursor(cursor) if cursor else None
+        qs = self._get_page_queryset(position)
+        records = list(qs[:self.per_page + 1])
+
+        count = None
+        if self.with_count:
+            count = capped_count(self.queryset, self.count_limit)
+
+        return self._make_page(records, position, count)
+
+    async def apage(self, cursor: Optional[str] = None) -> CursorPage:
+        """
+            async version of page (Django >= 4.1)
+        """
+        position = decode_cursor(cursor) if cursor else None
+        qs = self._get_page_queryset(position)
+        records = [record async for record in qs[:self.per_page + 1]]
+
+        count = None
+        if self.with_count:
+            count = await acapped_count(self.queryset, self.count_limit)
+
+        return self._make_page(records, position, count)
+
+    def _get_page_queryset(self, position: Optional[tuple]) -> QuerySet:
+        qs = self.queryset
+        if position and position[0] == CURSOR_PREVIOUS:
+            _, created, pk = position
+            return qs.filter(Q(created__gt=created) | Q(created=created, pk__gt=pk)).order_by('created', 'pk')
+
+        if position:
+            _, created, pk = position
+            qs = qs.filter(Q(created__lt=created) | Q(created=created, pk__lt=pk))
+        return qs.order_by('-created', '-pk')
+
+    def _make_page(self, records: list, position: Optional[tuple], count: Optional[int]) -> CursorPage:
+        """
+        :param records: up to per_page + 1 records of page queryset (one more - for checking next page)
+        """
+        if position and position[0] == CURSOR_PREVIOUS:
+            has_more_newer = len(records) > self.per_page
+            records = list(reversed(records[:self.per_page]))
+            has_newer, has_older = has_more_newer, True
+        else:
+            has_older = len(records) > self.per_page
+            records = records[:self.per_page]
+            has_newer = position is not None
+
+        next_cursor = previous_cursor = None
+        if records and has_older:
+            next_cursor = encode_cursor(CURSOR_NEXT, records[-1].created, records[-1].pk)
+        if records and has_newer:
+            previous_cursor = encode_cursor(CURSOR_PREVIOUS, records[0].created, records[0].pk)
+
+        return CursorPage(records, next_cursor, previous_cursor, count, self.count_limit)
@@ -0,0 +1,204 @@
+import re
+import threading
+import functools
+from collections import Counter
+from typing import Optional, Dict, Tuple, Union
+from django.conf import settings
+
+# exact names of sensitive keys, for SW_LOGGER_SCRUB_KEYS (scrubbing is disabled by default)
+SENSITIVE_KEYS = (
+    '^password$', '^passwd$', '^secret$', '^api_?key$', '^access_token$', '^refresh_token$', '^authorization$',
+    '^card_?number$', '^cvv$',
+)
+SCRUBBED = '********'
+TRUNCATED = '...'
+TRUNCATED_KEY = '__truncated__'
+MAX_CACHED_KEYS = 10000
+# truncation reasons (counters)
+REASON_BYTES = 'bytes'
+REASON_DEPTH = 'depth'
+REASON_LENGTH = 'length'
+REASON_SCRUBBED = 'scrubbed'
+
+_counters = Counter()
+_counters_lock = threading.Lock()
+
+
+def get_counters() -> Dict[Tuple[str, str], int]:
+    """
+    :return: {(field name, reason): number of truncated (or scrubbed) payloads}
+    """
+    with _counters_lock:
+        return dict(_counters)
+
+
+def reset_counters() -> None:
+    with _counters_lock:
+        _counters.clear()
+
+
+class Budget:
+    """
+        remaining bytes of payload (approximate size of JSON)
+    """
+    def __init__(self, max_bytes: Optional[int]):
+        self.remaining = max_bytes
+
+    def take(self, size: int) -> bool:
+        if self.remaining is None:
+            return True
+        self.remaining -= size
+        return self.remaining >= 0
+
+
+class PayloadPolicy:
+    """
+        Limits of request GET/POST and extra of log record: size in bytes (approximate size of JSON),
+        depth and length (items) of dicts and lists, values of keys matching scrub patterns are replaced.
+        Payload is limited in one pass, parts after limit are not converted.
+    """
+    def __init__(self, max_bytes: Optional[int] = None, max_depth: Optional[int] = None,
+                 max_length: Optional[int] = None, scrub_keys: Tuple[str, ...] = ()):
+        self.max_bytes = max_bytes
+        self.max_depth = max_depth
+        self.max_length = max_length
+        self.scrub_re = re.compile('|'.join(scrub_keys), re.IGNORECASE) if scrub_keys else None
+        # key -> is scrubbed (keys of requests are repeated)
+        self._scrubbed_keys = {}
+
+    def is_empty(self) -> bool:
+        return self.max_bytes is None and self.max_depth is None and self.max_length is None \
+            and self.scrub_re is None
+
+    def apply(self, value, field_name: str):
+        """
+        :return: limited copy of value (value itself, if policy is empty)
+        """
+        if value is None or self.is_empty():
+            return value
+
+        reasons = set()
+        value = self._limit(value, 1, Budget(self.max_bytes), reasons)
+        if reasons:
+            with _counters_lock:
+                for reason in reasons:
+                    _counters[(field_name, reason)] += 1
+        return value
+
+    def _limit(self, value, depth: int, budget: Budget, reasons: set):
+        if isinstance(value, dict):
+            return self._limit_dict(value, depth, budget, reasons)
+        if isinstance(value, (list, tuple)):
+            return self._limit_list(value, depth, budget, reasons)
+        if budget.remaining is None:
+            return value
+        if isinstance(value, str):
+            return self._limit_str(value, budget, reasons)
+        budget.take(len(str(value)))
+        return value
+
+    def _limit_str(self, value: str, budget: Budget, reasons: set) -> str:
+        size = len(value.encode('utf-8')) + 2
+        if budget.take(size):
+            return value
+        reasons.add(REASON_BYTES)
+        # characters up to remaining bytes (by byte length of utf-8, without broken characters)
+        allowed = max(size + budget.remaining - 2, 0)
+        return value.encode('utf-8')[:allowed].decode('utf-8', 'ignore') + TRUNCATED
+
+    def _is_container_allowed(self, depth: int, budget: Budget, reasons: set) -> bool:
+        if self.max_depth is not None and depth > self.max_depth:
+            reasons.add(REASON_DEPTH)
+            return False
+        if budget.remaining is not None and budget.remaining <= 0:
+            reasons.add(REASON_BYTES)
+            return False
+        return True
+
+    def _is_scrubbed(self, key: str) -> bool:
+        scrubbed = self._scrubbed_keys.get(key)
+        if scrubbed is None:
+            scrubbed = bool(self.scrub_re.search(key))
+            if len(self._scrubbed_keys) < MAX_CACHED_KEYS:
+                self._scrubbed_keys[key] = scrubbed
+        return scrubbed
+
+    def _get_stop_reason(self, index: int, budget: Budget) -> Optional[str]:
+        """
+        :return: reason for skipping items of container from index
+        """
+        if budget.remaining is not None and budget.remaining <= 0:
+            return REASON_BYTES
+        if self.max_length is not None and index >= self.max_length:
+            return REASON_LENGTH
+
+    def _limit_dict(self, value: dict, depth: int, budget: Budget, reasons: set) -> Union[dict, str]:
+        if not self._is_container_allowed(depth, budget, reasons):
+            return TRUNCATED
+
+        result = {}
+        budget.take(2)
+        for index, (key, item) in enumerate(value.items()):
+            reason = self._get_stop_reason(index, budget)
+            if reason:
+                reasons.add(reason)
+                result[TRUNCATED_KEY] = len(value) - index
+                break
+
+            key = str(key)
+            budget.take(len(key) + 4)
+            if self.scrub_re is not None and self._is_scrubbed(key):
+                reasons.add(REASON_SCRUBBED)
+                result[key] = SCRUBBED
+                budget.take(len(SCRUBBED) + 2)
+            else:
+                result[key] = self._limit(item, depth + 1, budget, reasons)
+        return result
+
+    def _limit_list(self, value, depth: int, budget: Budget, reasons: set) -> Union[list, str]:
+        if not self._is_container_allowed(depth, budget, reasons):
+            return TRUNCATED
+
+        result = []
+        budget.take(2)
+        for index, item in enumerate(value):
+            reason = self._get_stop_reason(index, budget)
+            if reason:
+                reasons.add(reason)
+                result.append(TRUNCATED)
+                break
+            result.append(self._limit(item, depth + 1, budget, reasons))
+            budget.take(1)
+        return result
+
+
+@functools.lru_cache(maxsize=None)
+def _get_policy(max_bytes: Optional[int], max_depth: Optional[int], max_length: Optional[int],
+                scrub_keys: Tuple[str, ...]) -> PayloadPolicy:
+    return PayloadPolicy(max_bytes, max_depth, max_length, scrub_keys)
+
+
+def get_policy(field_name: str) -> PayloadPolicy:
+    """
+        policy of field by settings:
+            SW_LOGGER_PAYLOAD_MAX_BYTES - bytes, for all fields or by field name, for example {"extra": 10000}
+            SW_LOGGER_PAYLOAD_MAX_DEPTH - depth of dicts and lists
+            SW_LOGGER_PAYLOAD_MAX_LENGTH - items of dicts and lists
+            SW_LOGGER_SCRUB_KEYS - regex patterns of keys with sensitive values (not scrubbed by default)
+    """
+    max_bytes = getattr(settings, 'SW_LOGGER_PAYLOAD_MAX_BYTES', None)
+    if isinstance(max_bytes, dict):
+        max_bytes = max_bytes.get(field_name)
+    return _get_policy(
+        max_bytes,
+        getattr(settings, 'SW_LOGGER_PAYLOAD_MAX_DEPTH', None),
+        getattr(settings, 'SW_LOGGER_PAYLOAD_MAX_LENGTH', None),
+        tuple(getattr(settings, 'SW_LOGGER_SCRUB_KEYS', None) or ()),
+    )
+
+
+def limit(value, field_name: str):
+    """
+    :return: value of log record field limited by policy of field
+    """
+    return get_policy(field_name).apply(value, field_name)
@@ -0,0 +1,162 @@
+import re
+import datetime
+from typing import Optional, List, Type
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import Model, QuerySet
+from django.utils import timezone
+
+from . import models
+
+PARTITION_SUFFIX_RE = re.compile(r'_p(\d{4})(\d{2})$')
+
+
+def get_retention() -> Optional[datetime.timedelta]:
+    """
+    :return: log storage period from SW_LOGGER_RETENTION setting (days or timedelta)
+    """
+    retention = getattr(settings, 'SW_LOGGER_RETENTION', None)
+    if retention is None or isinstance(retention, datetime.timedelta):
+        return retention
+    return datetime.timedelta(days=retention)
+
+
+def get_expiration_date() -> Optional[datetime.datetime]:
+    """
+    :return: log records created before that time are expired
+    """
+    retention = get_retention()
+    if retention is None:
+        return
+    return timezone.now() - retention
+
+
+def filter_actual(qs: QuerySet) -> QuerySet:
+    """
+        exclude expired log records. Restrict "created" range, so db can skip expired partitions.
+    """
+    expiration_date = get_expiration_date()
+    if expiration_date is None:
+        return qs
+    return qs.filter(created__gte=expiration_date)
+
+
+def purge_expired(log_model: Type[Model] = models.Log, batch_size: int = 10000) -> int:
+    """
+        delete expired log records by small batches (short transactions, without long table locks)
+    :return: number of deleted records
+    """
+    expiration_date = get_expiration_date()
+    if expiration_date is None:
+        return 0
+
+    expired_qs = log_model.objects.filter(created__lt=expiration_date).order_by('id')
+    deleted = 0
+    while True:
+        ids = list(expired_qs.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        log_model.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
+
+    return deleted
+
+
+def _get_connection(log_model: Type[Model]):
+    return connections[router.db_for_write(log_model)]
+
+
+def _month_start(date: datetime.datetime, months: int = 0) -> datetime.date:
+    month_index = date.year * 12 + date.month - 1 + months
+    return datetime.date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def is_partitioned(log_model: Type[Model] = models.Log) -> bool:
+    """
+    :return: is log table natively partitioned (PostgreSQL)
+    """
+    connection = _get_connection(log_model)
+    if connection.vendor != 'postgresql':
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = %s',
+            [log_model._meta.db_table],
+        )
+        return cursor.fetchone() is not None
+
+
+def get_partitions(log_model: Type[Model] = models.Log) -> List[str]:
+    """
+    :return: names of monthly partitions of log table
+    """
+    connection = _get_connection(log_model)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname FROM pg_inherits i '
+            'JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent '
+            'WHERE p.relname = %s ORDER BY c.relname',
+            [log_model._meta.db_table],
+        )
+        return [
+            row[0] for row in cursor.fetchall()
+            if PARTITION_SUFFIX_RE.search(row[0])
+        ]
+
+
+def create_partitions(log_model: Type[Model] = models.Log, months_ahead: int = 2) -> List[str]:
+    """
+        create monthly partitions from current month up to months_ahead
+    :return: names of created partitions
+    """
+    connection = _get_connection(log_model)
+    table = log_model._meta.db_table
+    existing = set(get_partitions(log_model))
+    now = timezone.now()
+
+    created = []
+    with connection.cursor() as cursor:
+        for months in range(months_ahead + 1):
+            start = _month_start(now, months)
+            end = _month_start(now, months + 1)
+            partition = '%s_p%s' % (table, start.strftime('%Y%m'))
+            if partition in existing:
+                continue
+
+            cursor.execute('CREATE TABLE %s PARTITION OF %s FOR VALUES FROM (%%s) TO (%%s)' % (
+                connection.ops.quote_name(partition), connection.ops.quote_name(table),
+            ), [start, end])
+            created.append(partition)
+
+    return created
+
+
+def drop_expired_partitions(log_model: Type[Model] = models.Log, archive: bool = False) -> List[str]:
+    """
+        drop (or only detach, if archive) partitions with all records expired
+    :return: names of dropped (detached) partitions
+    """
+    expiration_date = get_expiration_date()
+    if expiration_date is None:
+        return []
+
+    connection = _get_connection(log_model)
+    table = log_model._meta.db_table
+    expiration_month = _month_start(expiration_date)
+
+    dropped = []
+    with connection.cursor() as cursor:
+        for partition in get_partitions(log_model):
+            year, month = PARTITION_SUFFIX_RE.search(partition).groups()
+            if datetime.date(int(year), int(month), 1) >= expiration_month:
+                continue
+
+            cursor.execute('ALTER TABLE %s DETACH PARTITION %s' % (
+                connection.ops.quote_name(table), connection.ops.quote_name(partition),
+            ))
+            if not archive:
+                cursor.execute('DROP TABLE %s' % connection.ops.quote_name(partition))
+            dropped.append(partition)
+
+    return dropped
@@ -0,0 +1,61 @@
+from typing import Optional, Type
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Model
+
+APP_LABEL = 'sw_logger'
+
+
+def get_database() -> Optional[str]:
+    """
+    :return: db alias for log records (SW_LOGGER_DATABASE setting), None - default routing
+    """
+    return getattr(settings, 'SW_LOGGER_DATABASE', None)
+
+
+def get_read_database() -> Optional[str]:
+    """
+    :return: db alias for reading log records in log view and admin (SW_LOGGER_READ_DATABASE setting,
+        for example, replica), by default - SW_LOGGER_DATABASE
+    """
+    return getattr(settings, 'SW_LOGGER_READ_DATABASE', None) or get_database()
+
+
+def is_logger_model(model: Type[Model]) -> bool:
+    """
+        models of sw_logger and customized log models (inherited from sw_logger.models.Log)
+    """
+    from . import models
+    return model._meta.app_label == APP_LABEL or issubclass(model, models.Log)
+
+
+class LogRouter:
+    """
+        Route sw_logger models to SW_LOGGER_DATABASE. Log records are written by own connection,
+        so they are not rolled back with transactions of application (and not hold them).
+
+        DATABASE_ROUTERS = ['sw_logger.routers.LogRouter']
+    """
+    def db_for_read(self, model, **hints):
+        if is_logger_model(model):
+            return get_database()
+
+    def db_for_write(self, model, **hints):
+        if is_logger_model(model):
+            return get_database()
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        database = get_database()
+        if database is None:
+            return
+
+        if app_label == APP_LABEL:
+            return db == database
+
+        if model_name:
+            try:
+                model = apps.get_model(app_label, model_name)
+            except LookupError:
+                return
+            if is_logger_model(model):
+                return db == database
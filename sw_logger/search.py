@@ -0,0 +1,108 @@
+from typing import Type
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import Model, QuerySet, BooleanField
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from . import models
+
+
+class SearchBackend:
+    """
+        Default log search: substring of message (without index)
+    """
+    def search(self, qs: QuerySet, query: str) -> QuerySet:
+        return qs.filter(message__icontains=query)
+
+    def setup(self, log_model: Type[Model] = models.Log) -> None:
+        """
+            create db structures (indexes, tables) for search
+        """
+        pass
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+        Full text search by message, extra and object_data with GIN index (PostgreSQL).
+        Values compressed by SW_LOGGER_COMPRESS_THRESHOLD are not searchable.
+    """
+    config = 'simple'
+
+    def get_document_sql(self) -> str:
+        return "to_tsvector('%s', coalesce(message, '') || ' ' || coalesce(extra::text, '') || ' ' || " \
+               "coalesce(object_data::text, ''))" % self.config
+
+    def search(self, qs: QuerySet, query: str) -> QuerySet:
+        sql = "%s @@ plainto_tsquery('%s', %%s)" % (self.get_document_sql(), self.config)
+        return qs.filter(RawSQL(sql, [query], output_field=BooleanField()))
+
+    def setup(self, log_model: Type[Model] = models.Log) -> None:
+        table = log_model._meta.db_table
+        connection = connections[router.db_for_write(log_model)]
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE INDEX IF NOT EXISTS %s ON %s USING gin ((%s))' % (
+                connection.ops.quote_name(table + '_search_idx'),
+                connection.ops.quote_name(table),
+                self.get_document_sql(),
+            ))
+
+
+class SqliteFtsSearchBackend(SearchBackend):
+    """
+        Full text search by message, extra and object_data with FTS5 shadow table (SQLite).
+        Shadow table synced with log table by triggers. Values compressed by SW_LOGGER_COMPRESS_THRESHOLD
+        are not searchable.
+    """
+    def get_fts_table(self, log_model: Type[Model] = models.Log) -> str:
+        return log_model._meta.db_table + '_fts'
+
+    def search(self, qs: QuerySet, query: str) -> QuerySet:
+        # each word as phrase, for escaping FTS query syntax
+        fts_query = ' '.join('"%s"' % word.replace('"', '""') for word in query.split())
+        if not fts_query:
+            return qs
+
+        fts_table = self.get_fts_table(qs.model)
+        sql = 'SELECT rowid FROM %s WHERE %s MATCH %%s' % (fts_table, fts_table)
+        return qs.filter(pk__in=RawSQL(sql, [fts_query]))
+
+    def setup(self, log_model: Type[Model] = models.Log) -> None:
+        table = log_model._meta.db_table
+        fts_table = self.get_fts_table(log_model)
+        columns = 'message, extra, object_data'
+        new_values = 'new.id, new.message, new.extra, new.object_data'
+        old_values = "'delete', old.id, old.message, old.extra, old.object_data"
+
+        connection = connections[router.db_for_write(log_model)]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({columns}, content='{table}', content_rowid='id')"
+                .format(fts=fts_table, columns=columns, table=table)
+            )
+            cursor.execute(
+                'CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN '
+                'INSERT INTO {fts}(rowid, {columns}) VALUES ({new}); END'
+                .format(fts=fts_table, table=table, columns=columns, new=new_values)
+            )
+            cursor.execute(
+                'CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN '
+                'INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ({old}); END'
+                .format(fts=fts_table, table=table, columns=columns, old=old_values)
+            )
+            cursor.execute(
+                'CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN '
+                'INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ({old}); '
+                'INSERT INTO {fts}(rowid, {columns}) VALUES ({new}); END'
+                .format(fts=fts_table, table=table, columns=columns, old=old_values, new=new_values)
+            )
+            # index existing records
+            cursor.execute("INSERT INTO {fts}({fts}) VALUES ('rebuild')".format(fts=fts_table))
+
+
+def get_search_backend() -> SearchBackend:
+    """
+    :return: backend from SW_LOGGER_SEARCH_BACKEND setting (class path)
+    """
+    backend_path = getattr(settings, 'SW_LOGGER_SEARCH_BACKEND', 'sw_logger.search.SearchBackend')
+    return import_string(backend_path)()
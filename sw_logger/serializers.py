@@ -0,0 +1,150 @@
+import json
+import uuid
+import decimal
+import datetime
+import functools
+from typing import Callable, List, Tuple, Type
+from django.conf import settings
+from django.db import models
+from django.db.models import Model
+from django.db.models.fields.files import FieldFile
+
+from . import consts
+
+
+def _convert_value(value):
+    """
+        generic converter (for fields without specific converter), same as tools._converter
+    """
+    if isinstance(value, dict):
+        return {key: _convert_value(item) for key, item in value.items()}
+    if isinstance(value, FieldFile):
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode('utf-8')
+    if isinstance(value, decimal.Decimal):
+        return [str(value)]
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _convert_isoformat(value):
+    # value can be not converted yet by field (for example, string assigned to not saved object)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return value
+
+
+def _convert_decimal(value):
+    # list - compatibility with tools.model_to_dict
+    if isinstance(value, decimal.Decimal):
+        return [str(value)]
+    return value
+
+
+def _convert_bytes(value):
+    if isinstance(value, bytes):
+        return value.decode('utf-8')
+    return value
+
+
+FIELD_CONVERTERS = (
+    (models.FileField, str),
+    (models.DateTimeField, _convert_isoformat),
+    (models.DateField, _convert_isoformat),
+    (models.TimeField, _convert_isoformat),
+    (models.DecimalField, _convert_decimal),
+    (models.BinaryField, _convert_bytes),
+    # compatibility with tools.model_to_dict: UUID stored as string, even None
+    (models.UUIDField, str),
+    (models.CharField, None),
+    (models.TextField, None),
+    (models.IntegerField, None),
+    (models.BooleanField, None),
+    (models.FloatField, None),
+)
+
+
+def _get_field_converter(field: models.Field) -> Callable:
+    for field_class, converter in FIELD_CONVERTERS:
+        if isinstance(field, field_class):
+            return converter
+    return _convert_value
+
+
+@functools.lru_cache(maxsize=None)
+def get_plan(model: Type[Model]) -> Tuple[List[tuple], List[tuple]]:
+    """
+        serialization plan of model (computed once per model)
+    :return: ([(field name, attribute name, converter), ...], [(m2m field name, attribute name), ...])
+    """
+    fields = []
+    for field in model._meta.concrete_fields:
+        # as django.forms.model_to_dict, except UUID fields
+        if not getattr(field, 'editable', False) and not isinstance(field, models.UUIDField):
+            continue
+        fields.append((field.name, field.attname, _get_field_converter(field)))
+
+    m2m_fields = [
+        (field.name, field.attname)
+        for field in model._meta.many_to_many
+        if getattr(field, 'editable', False)
+    ]
+
+    return fields, m2m_fields
+
+
+def model_to_dict(obj: Model) -> dict:
+    """
+        Faster equivalent of tools.model_to_dict. Many-to-many values are taken from prefetched objects
+        or fetched as list of primary keys (without model instances).
+    """
+    fields, m2m_fields = get_plan(type(obj))
+
+    obj_dict = {}
+    for name, attname, converter in fields:
+        value = getattr(obj, attname)
+        obj_dict[name] = converter(value) if converter else value
+
+    prefetched = getattr(obj, '_prefetched_objects_cache', {})
+    for name, attname in m2m_fields:
+        if obj.pk is None:
+            obj_dict[name] = []
+        elif name in prefetched:
+            obj_dict[name] = [item.pk for item in prefetched[name]]
+        else:
+            obj_dict[name] = list(getattr(obj, attname).values_list('pk', flat=True))
+
+    return obj_dict
+
+
+@functools.lru_cache(maxsize=None)
+def _get_dumps(backend: str) -> Callable[[object], str]:
+    if backend == consts.JSON_BACKEND_ORJSON:
+        try:
+            import orjson
+            # not string keys are converted to strings (as by json)
+            return lambda data: orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except ImportError:
+            pass
+
+    if backend == consts.JSON_BACKEND_MSGSPEC:
+        try:
+            import msgspec
+            encoder = msgspec.json.Encoder()
+            return lambda data: encoder.encode(data).decode('utf-8')
+        except ImportError:
+            pass
+
+    return json.dumps
+
+
+def dumps(data) -> str:
+    """
+        JSON serialization by SW_LOGGER_JSON_BACKEND ("json", "orjson" or "msgspec"),
+        if backend package is not installed - by standard json
+    """
+    return _get_dumps(getattr(settings, 'SW_LOGGER_JSON_BACKEND', consts.JSON_BACKEND_JSON))(data)
@@ -0,0 +1,60 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+from django.conf import settings
+
+
+class ObjectStateCache:
+    """
+        In-process cache of last logged object data:
+        (object_name, object_id) -> (object data, deltas after keyframe, chain key of keyframe).
+        Saves query of previous object log on writing. Deltas are computed against cached data only
+        (previous records of object can be not saved yet), so deltas of process are chained to its own keyframe.
+    """
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, object_name: str, object_id: int) -> Optional[Tuple[dict, int, str]]:
+        with self._lock:
+            state = self._data.get((object_name, object_id))
+            if state is not None:
+                self._data.move_to_end((object_name, object_id))
+            return state
+
+    def set(self, object_name: str, object_id: int, object_data: dict, deltas_count: int, chain: str = '') -> None:
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._data[(object_name, object_id)] = (object_data, deltas_count, chain)
+            self._data.move_to_end((object_name, object_id))
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# objects, if SW_LOGGER_KEYFRAME_INTERVAL > 1 or SW_LOGGER_STORE_CHANGES and SW_LOGGER_SNAPSHOT_CACHE_SIZE is not set
+DEFAULT_DELTA_CACHE_SIZE = 10000
+
+_cache = None
+
+
+def get_cache() -> ObjectStateCache:
+    """
+    :return: cache with size from SW_LOGGER_SNAPSHOT_CACHE_SIZE setting
+        (by default DEFAULT_DELTA_CACHE_SIZE for storing deltas or changes, otherwise disabled)
+    """
+    global _cache
+    if _cache is None:
+        size = getattr(settings, 'SW_LOGGER_SNAPSHOT_CACHE_SIZE', None)
+        if size is None:
+            keyframe_interval = getattr(settings, 'SW_LOGGER_KEYFRAME_INTERVAL', None) or 1
+            store_changes = getattr(settings, 'SW_LOGGER_STORE_CHANGES', False)
+            size = DEFAULT_DELTA_CACHE_SIZE if keyframe_interval > 1 or store_changes else 0
+        _cache = ObjectStateCache(size)
+    return _cache
@@ -0,0 +1,241 @@
+import io
+import os
+import re
+import csv
+import json
+import time
+import threading
+from typing import Optional, List, Tuple, Type
+from django.core.exceptions import ValidationError
+from django.db import connections, router, transaction
+from django.db.models import Model, JSONField
+
+SEGMENT_RE = re.compile(r'^(\d+)-(\d+)\.spool$')
+
+
+class SpoolWriter:
+    """
+        Append-only segment files of one process: "<pid>-<number>.spool", one JSON line per record.
+        New segment is started when current is bigger than segment_size and after fork.
+    """
+    def __init__(self, directory: str, segment_size: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.fd = None
+        self.pid = None
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def write(self, line: str):
+        data = (line + '\n').encode('utf-8')
+        with self.lock:
+            if self.fd is None or self.pid != os.getpid() or self.size >= self.segment_size:
+                self._open_segment()
+
+            # whole line by one write call, so collector don't see parts of lines (except last)
+            view = memoryview(data)
+            while view:
+                written = os.write(self.fd, view)
+                view = view[written:]
+            self.size += len(data)
+
+    def close(self):
+        with self.lock:
+            if self.fd is not None and self.pid == os.getpid():
+                os.close(self.fd)
+            self.fd = None
+
+    def _open_segment(self):
+        if self.fd is not None and self.pid == os.getpid():
+            os.close(self.fd)
+
+        os.makedirs(self.directory, exist_ok=True)
+        self.pid = os.getpid()
+        name = '%s-%s.spool' % (self.pid, int(time.time() * 1000000))
+        self.fd = os.open(os.path.join(self.directory, name), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.size = 0
+
+
+def get_segments(directory: str) -> List[Tuple[int, int, str]]:
+    """
+    :return: [(pid, segment number, path), ...] ordered by pid and number
+    """
+    if not os.path.isdir(directory):
+        return []
+
+    segments = []
+    for name in os.listdir(directory):
+        match = SEGMENT_RE.match(name)
+        if match:
+            segments.append((int(match.group(1)), int(match.group(2)), os.path.join(directory, name)))
+    return sorted(segments)
+
+
+def _is_process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_lines(file, limit: int) -> Tuple[List[bytes], int]:
+    """
+    :return: complete lines (not more than limit) and number of read bytes
+    """
+    lines = []
+    size = 0
+    while len(lines) < limit:
+        line = file.readline()
+        if not line.endswith(b'\n'):
+            # end of file or line is being written
+            break
+        lines.append(line)
+        size += len(line)
+    return lines, size
+
+
+def _is_completely_read(path: str, offset: int) -> bool:
+    """
+        are all complete lines of segment read
+    """
+    with open(path, 'rb') as file:
+        file.seek(offset)
+        return b'\n' not in file.read()
+
+
+def copy_logs(logs: List[Model], using: str) -> None:
+    """
+        insert log records by COPY (PostgreSQL), without primary keys
+    """
+    log_model = type(logs[0])
+    connection = connections[using]
+    fields = [field for field in log_model._meta.concrete_fields if not field.primary_key]
+
+    buffer = io.StringIO()
+    # not quoted empty value - NULL, quoted - empty string
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+    for log in logs:
+        row = []
+        for field in fields:
+            value = getattr(log, field.attname)
+            if value is None:
+                row.append(None)
+            elif isinstance(field, JSONField):
+                row.append(field.to_json(value) if hasattr(field, 'to_json') else json.dumps(value))
+            else:
+                row.append(field.get_db_prep_save(value, connection))
+        writer.writerow(row)
+    buffer.seek(0)
+
+    sql = 'COPY %s (%s) FROM STDIN WITH (FORMAT csv)' % (
+        connection.ops.quote_name(log_model._meta.db_table),
+        ', '.join(connection.ops.quote_name(field.column) for field in fields),
+    )
+    with connection.cursor() as cursor:
+        raw_cursor = cursor.cursor
+        if hasattr(raw_cursor, 'copy_expert'):
+            # psycopg2
+            raw_cursor.copy_expert(sql, buffer)
+        else:
+            # psycopg 3
+            with raw_cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+
+def _insert_logs(logs: List[Model], using: str) -> None:
+    from . import tools
+
+    log_model = type(logs[0])
+    if connections[using].vendor == 'postgresql' and not log_model._meta.parents:
+        copy_logs(logs, using)
+    else:
+        tools.save_logs(logs)
+
+
+def collect_segment(path: str, log_model: Optional[Type[Model]] = None, batch_size: int = 1000) -> Tuple[int, int, int]:
+    """
+        save new complete records of segment file to db by batches. Each batch is saved with
+        segment offset (Checkpoint) in one transaction, so records are saved exactly once.
+    :return: (number of saved records, number of skipped broken lines, segment offset)
+    """
+    from . import models
+    from . import archive
+
+    log_model = log_model or models.Log
+    using = router.db_for_write(log_model)
+    checkpoint_name = 'spool:%s' % os.path.abspath(path)
+    fields_by_name = {field.attname: field for field in log_model._meta.concrete_fields}
+
+    offset = models.Checkpoint.objects.using(using) \
+        .filter(name=checkpoint_name).values_list('value', flat=True).first() or 0
+
+    saved = skipped = 0
+    with open(path, 'rb') as file:
+        file.seek(offset)
+        while True:
+            lines, size = _read_lines(file, batch_size)
+            if not lines:
+                break
+
+            logs = []
+            for line in lines:
+                # broken line (not JSON, not object, wrong field value) is skipped
+                try:
+                    logs.append(archive.row_to_log(log_model, json.loads(line), fields_by_name))
+                except (ValueError, TypeError, AttributeError, ValidationError):
+                    pass
+
+            with transaction.atomic(using=using):
+                checkpoint, _ = models.Checkpoint.objects.using(using).select_for_update() \
+                    .get_or_create(name=checkpoint_name)
+                if checkpoint.value != offset:
+                    # segment is processed by other collector
+                    break
+
+                if logs:
+                    _insert_logs(logs, using)
+                checkpoint.value = offset + size
+                checkpoint.save(using=using, update_fields=['value', 'updated'])
+
+            offset += size
+            saved += len(logs)
+            skipped += len(lines) - len(logs)
+
+    return saved, skipped, offset
+
+
+def collect(directory: str, log_model: Optional[Type[Model]] = None, batch_size: int = 1000) -> Tuple[int, int]:
+    """
+        save records of all segment files of directory to db.
+        Completely saved segments of finished processes and rotated segments are deleted.
+    :return: (number of saved records, number of skipped broken lines)
+    """
+    from . import models
+
+    last_numbers = {}
+    segments = get_segments(directory)
+    for pid, number, _ in segments:
+        last_numbers[pid] = max(number, last_numbers.get(pid, number))
+
+    saved = skipped = 0
+    for pid, number, path in segments:
+        # check before reading - process can write last records before exit
+        finished = number < last_numbers[pid] or not _is_process_alive(pid)
+
+        segment_saved, segment_skipped, offset = collect_segment(path, log_model, batch_size)
+        saved += segment_saved
+        skipped += segment_skipped
+
+        if finished and _is_completely_read(path, offset):
+            if offset < os.path.getsize(path):
+                # last line was not written completely
+                skipped += 1
+            # file first - offset of existing file must not be lost
+            os.remove(path)
+            models.Checkpoint.objects.using(router.db_for_write(log_model or models.Log)) \
+                .filter(name='spool:%s' % os.path.abspath(path)).delete()
+
+    return saved, skipped
@@ -0,0 +1,136 @@
+import datetime
+from collections import OrderedDict
+from typing import Optional, List, Type
+from django.db import router, transaction
+from django.db.models import Model, QuerySet, Count, Sum, Max
+from django.db.models.functions import TruncHour, TruncDay
+
+from . import models
+from .exceptions import LoggerException
+
+DIMENSIONS = ('level', 'action', 'object_name', 'user_id', 'username')
+PERIOD_HOUR = 'hour'
+PERIOD_DAY = 'day'
+PERIODS = {
+    PERIOD_HOUR: TruncHour,
+    PERIOD_DAY: TruncDay,
+}
+
+
+def _get_checkpoint_name(log_model: Type[Model]) -> str:
+    return 'rollup:%s' % log_model._meta.db_table
+
+
+def _truncate(period: str, field_name: str):
+    if period not in PERIODS:
+        raise LoggerException('Unknown stats period "%s"' % period)
+    return PERIODS[period](field_name, tzinfo=datetime.timezone.utc)
+
+
+def _aggregate(qs: QuerySet, period: str, group_by: List[str], time_field: str, count) -> List[dict]:
+    return list(
+        qs.annotate(stat_bucket=_truncate(period, time_field))
+        .values('stat_bucket', *group_by)
+        .annotate(stat_count=count)
+        .order_by()
+    )
+
+
+def rollup(log_model: Type[Model] = models.Log, batch_size: int = 100000) -> int:
+    """
+        add counts of log records created since last rollup (by id watermark in Checkpoint) to LogStat.
+        Records are processed by id ranges, each range in one transaction with watermark.
+        Run in one process; records inserted by long transactions after rollup of its id range are not counted.
+    :return: number of processed log records
+    """
+    using = router.db_for_write(models.LogStat)
+    checkpoint_name = _get_checkpoint_name(log_model)
+    processed = 0
+
+    while True:
+        with transaction.atomic(using=using):
+            checkpoint, _ = models.Checkpoint.objects.using(using).select_for_update() \
+                .get_or_create(name=checkpoint_name)
+
+            # last id of range: batch_size-th new record or last record
+            new_qs = log_model.objects.filter(id__gt=checkpoint.value)
+            ids = list(new_qs.order_by('id').values_list('id', flat=True)[batch_size - 1:batch_size])
+            is_last_range = not ids
+            last_id = ids[0] if ids else new_qs.aggregate(max_id=Max('id'))['max_id']
+            if last_id is None:
+                return processed
+
+            range_qs = new_qs.filter(id__lte=last_id)
+            rows = _aggregate(range_qs, PERIOD_HOUR, list(DIMENSIONS), 'created', Count('id'))
+            _add_counts(rows, using)
+
+            checkpoint.value = last_id
+            checkpoint.save(using=using, update_fields=['value', 'updated'])
+
+        processed += sum(row['stat_count'] for row in rows)
+        if is_last_range:
+            return processed
+
+
+def _add_counts(rows: List[dict], using: str) -> None:
+    buckets = {row['stat_bucket'] for row in rows}
+    existing = {
+        (stat.bucket,) + tuple(getattr(stat, name) for name in DIMENSIONS): stat
+        for stat in models.LogStat.objects.using(using).filter(bucket__in=buckets)
+    }
+
+    to_update = []
+    to_create = []
+    for row in rows:
+        values = {name: row[name] for name in DIMENSIONS}
+        stat = existing.get((row['stat_bucket'],) + tuple(values.values()))
+        if stat:
+            stat.count += row['stat_count']
+            to_update.append(stat)
+        else:
+            to_create.append(models.LogStat(bucket=row['stat_bucket'], count=row['stat_count'], **values))
+
+    models.LogStat.objects.using(using).bulk_update(to_update, ['count'])
+    models.LogStat.objects.using(using).bulk_create(to_create)
+
+
+def get_stats(group_by: Optional[List[str]] = None, period: str = PERIOD_HOUR,
+              date_from: Optional[datetime.datetime] = None, date_to: Optional[datetime.datetime] = None,
+              include_recent: bool = True, log_model: Type[Model] = models.Log, **filters) -> List[dict]:
+    """
+        number of log records by time buckets (hour or day, UTC) and dimensions
+        ("level", "action", "object_name", "user_id", "username")
+    :param filters: values of dimensions, for example level="ERROR" or object_name__in=[...]
+    :param include_recent: count records not processed by rollup yet (from log table)
+    :return: [{"bucket": datetime, <group_by dimensions>..., "count": int}, ...] ordered by bucket
+    """
+    group_by = list(group_by or [])
+    for name in group_by + [name.split('__')[0] for name in filters]:
+        if name not in DIMENSIONS:
+            raise LoggerException('Unknown stats dimension "%s"' % name)
+
+    stat_qs = models.LogStat.objects.filter(**filters)
+    if date_from:
+        stat_qs = stat_qs.filter(bucket__gte=date_from)
+    if date_to:
+        stat_qs = stat_qs.filter(bucket__lt=date_to)
+    rows = _aggregate(stat_qs, period, group_by, 'bucket', Sum('count'))
+
+    if include_recent:
+        last_id = models.Checkpoint.objects.filter(name=_get_checkpoint_name(log_model)) \
+            .values_list('value', flat=True).first() or 0
+        log_qs = log_model.objects.filter(id__gt=last_id, **filters)
+        if date_from:
+            log_qs = log_qs.filter(created__gte=date_from)
+        if date_to:
+            log_qs = log_qs.filter(created__lt=date_to)
+        rows += _aggregate(log_qs, period, group_by, 'created', Count('id'))
+
+    stats = OrderedDict()
+    for row in sorted(rows, key=lambda item: item['stat_bucket']):
+        key = (row['stat_bucket'],) + tuple(row[name] for name in group_by)
+        if key not in stats:
+            stats[key] = dict({'bucket': row['stat_bucket']}, **{name: row[name] for name in group_by}, count=0)
+        stats[key]['count'] += row['stat_count']
+
+    return list(stats.values())
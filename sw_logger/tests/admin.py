@@ -0,0 +1,6 @@
+from django.contrib import admin
+
+from sw_logger import admin as sw_logger_admin
+from sw_logger import models
+
+admin.site.register(models.Log, sw_logger_admin.Log)
@@ -0,0 +1,28 @@
+from django.db import models
+
+
+class Author(models.Model):
+    LOG_NAME = 'test_author'
+
+    name = models.CharField(max_length=100)
+
+    def __str__(self):
+        return self.name
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=100)
+
+    def __str__(self):
+        return self.name
+
+
+class Book(models.Model):
+    LOG_NAME = 'test_book'
+
+    name = models.CharField(max_length=100)
+    author = models.ForeignKey(Author, null=True, on_delete=models.SET_NULL)
+    tags = models.ManyToManyField(Tag, blank=True)
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,72 @@
+from datetime import timedelta
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.db import connection
+from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from sw_logger import admin as sw_logger_admin
+from sw_logger import models
+
+
+class ChangeListTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        now = timezone.now()
+        # records with same creation time - cursor is (created, id)
+        models.Log.objects.bulk_create([
+            models.Log(message='m%s' % i, func_name='f', level='INFO', created=now + timedelta(seconds=i // 2))
+            for i in range(75)
+        ])
+
+    def get_changelist(self, model_admin_class, query_string: str = ''):
+        request = RequestFactory().get('/admin/sw_logger/log/' + query_string)
+        request.user = self.user
+        request.session = {}
+        request._messages = FallbackStorage(request)
+
+        model_admin = model_admin_class(models.Log, admin.site)
+        response = model_admin.changelist_view(request)
+        response.render()
+        self.assertEqual(response.status_code, 200)
+        return response.context_data['cl']
+
+    def test_cursor_pages(self):
+        class LogAdmin(sw_logger_admin.Log):
+            cursor_pagination = True
+            list_per_page = 30
+
+        messages = []
+        pages = []
+        query_string = ''
+        while True:
+            changelist = self.get_changelist(LogAdmin, query_string)
+            pages.append(query_string)
+            messages += [log.message for log in changelist.result_list]
+            if not changelist.cursor_page.has_next():
+                break
+            query_string = changelist.get_next_url()
+
+        self.assertEqual(messages, ['m%s' % i for i in reversed(range(75))])
+        self.assertEqual(len(pages), 3)
+
+        changelist = self.get_changelist(LogAdmin, changelist.get_previous_url())
+        self.assertEqual([log.message for log in changelist.result_list], ['m%s' % i for i in range(44, 14, -1)])
+
+    def test_count_limit(self):
+        class LogAdmin(sw_logger_admin.Log):
+            count_limit = 50
+
+        with CaptureQueriesContext(connection) as queries:
+            changelist = self.get_changelist(LogAdmin)
+
+        self.assertEqual(changelist.result_count, 50)
+        self.assertFalse(changelist.show_full_result_count)
+        self.assertFalse(changelist.can_show_all)
+        # count of filtered records only (limited), without count of all records
+        counts = [query['sql'] for query in queries.captured_queries if 'COUNT(' in query['sql']]
+        self.assertEqual(len(counts), 1)
+        self.assertIn('LIMIT', counts[0])
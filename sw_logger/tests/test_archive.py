@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+from django.db import connection
+from django.test import TestCase
+
+from sw_logger import archive
+from sw_logger import models
+
+FIELDS = ['id', 'message', 'level', 'object_id', 'object_data', 'extra', 'http_request_get', 'created', 'last_seen']
+
+
+class RoundTripTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = os.path.join(directory, 'log')
+
+        extras = ['123', '', 'null', {'a': [1, 'в', None]}, None, [1, 2], 1.5, True]
+        for i, extra in enumerate(extras):
+            models.Log.objects.create(
+                message='message %s' % i, func_name='f', level='INFO', extra=extra,
+                object_id=i or None, object_data={'id': i, 'name': '"quoted", \\n'} if i else None,
+                http_request_get={'q': ['1', '2']} if i % 2 else None,
+            )
+
+    def get_rows(self) -> list:
+        return list(models.Log.objects.order_by('id').values_list(*FIELDS))
+
+    def assert_round_trip(self, path: str):
+        rows = self.get_rows()
+        self.assertEqual(archive.export_logs(path, delete=True), len(rows))
+        self.assertEqual(models.Log.objects.count(), 0)
+
+        self.assertEqual(archive.import_logs(path), len(rows))
+        self.assertEqual(self.get_rows(), rows)
+        self.assertIsInstance(models.Log.objects.get(message='message 0').extra, str)
+
+    def test_jsonl_gz(self):
+        self.assert_round_trip(self.path + '.jsonl.gz')
+
+    def test_csv(self):
+        self.assert_round_trip(self.path + '.csv')
+
+    def test_sequences_reset(self):
+        path = self.path + '.jsonl'
+        archive.export_logs(path, delete=True)
+        with mock.patch.object(connection.ops, 'sequence_reset_sql', return_value=[]) as sequence_reset_sql:
+            archive.import_logs(path)
+        self.assertEqual(sequence_reset_sql.call_args[0][1], [models.Log])
+
+        # new records after imported ones
+        log = models.Log.objects.create(message='new', func_name='f')
+        self.assertGreater(log.id, models.Log.objects.exclude(id=log.id).order_by('-id')[0].id)
+
+    def test_without_ids(self):
+        path = self.path + '.csv'
+        archive.export_logs(path)
+        self.assertEqual(archive.import_logs(path, keep_ids=False), 8)
+        self.assertEqual(models.Log.objects.filter(message='message 3').count(), 2)
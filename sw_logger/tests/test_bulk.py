@@ -0,0 +1,61 @@
+import logging
+from django.test import TestCase, RequestFactory
+from django.contrib.auth.models import User
+
+from sw_logger import bulk
+from sw_logger import consts
+from sw_logger import handlers
+from sw_logger import models
+from .models import Author, Book, Tag
+
+
+class LogObjectsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(name='author')
+        cls.tags = [Tag.objects.create(name='tag %s' % i) for i in range(3)]
+        for i in range(10):
+            book = Book.objects.create(name='book %s' % i, author=author)
+            book.tags.set(cls.tags[:i % 3])
+
+    def test_stored_data(self):
+        request = RequestFactory().post('/books/')
+        request.user = User.objects.create(username='user')
+
+        count = bulk.log_objects(
+            Book.objects.order_by('id'), 'books archived', action=consts.ACTION_UPDATED, request=request,
+            extra={'reason': 'test'}, batch_size=4,
+        )
+
+        self.assertEqual(count, 10)
+        logs = list(models.Log.objects.order_by('id'))
+        self.assertEqual(
+            [(log.object_id, log.get_object_data()['tags']) for log in logs],
+            [(book.id, [tag.id for tag in book.tags.order_by('id')]) for book in Book.objects.order_by('id')],
+        )
+        for log in logs:
+            self.assertEqual((log.message, log.action, log.level), ('books archived', consts.ACTION_UPDATED, 'INFO'))
+            self.assertEqual((log.object_name, log.username, log.http_path), (Book.LOG_NAME, 'user', '/books/'))
+            self.assertEqual(log.extra, {'reason': 'test'})
+            self.assertEqual(log.func_name.split('; ')[0].rsplit('.', 1)[-1], 'test_stored_data')
+
+    def test_queries_queryset(self):
+        # books (chunks of one query on SQLite), by batch: tags, insert
+        with self.assertNumQueries(1 + 2 * 3):
+            bulk.log_objects(Book.objects.order_by('id'), 'message', batch_size=4)
+
+    def test_queries_list(self):
+        books = list(Book.objects.order_by('id'))
+        # by batch: tags, insert
+        with self.assertNumQueries(2 * 3):
+            self.assertEqual(bulk.log_objects(books, 'message', batch_size=4), 10)
+        self.assertEqual(models.Log.objects.count(), 10)
+
+    def test_handler_level_and_filters(self):
+        handler = handlers.DbHandler(level=logging.WARNING)
+        self.assertEqual(bulk.log_objects(Book.objects.all(), 'message', handler=handler), 0)
+
+        handler = handlers.DbHandler()
+        handler.addFilter(lambda record: record.object.name != 'book 1')
+        self.assertEqual(bulk.log_objects(Book.objects.all(), 'message', handler=handler), 9)
+        self.assertEqual(models.Log.objects.count(), 9)
@@ -0,0 +1,87 @@
+from unittest import mock
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+
+from sw_logger import capture
+from sw_logger import consts
+from sw_logger import models
+from sw_logger import tools
+from .models import Author, Book, Tag
+
+
+def get_logs() -> list:
+    return [
+        (log.action, log.object_name, log.get_object_data()['name'])
+        for log in models.Log.objects.order_by('id')
+    ]
+
+
+@override_settings(SW_LOGGER_AUTO_CAPTURE=[Book.LOG_NAME])
+class CaptureTestCase(TransactionTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # changes are captured only with setting, connected signals don't affect other tests
+        capture.connect()
+
+    def test_saves_merged_on_commit(self):
+        with transaction.atomic():
+            book = Book.objects.create(name='a')
+            for name in ('b', 'c'):
+                book.name = name
+                book.save()
+            self.assertEqual(get_logs(), [])
+        self.assertEqual(get_logs(), [(consts.ACTION_CREATED, Book.LOG_NAME, 'c')])
+
+    def test_not_captured_model(self):
+        Author.objects.create(name='author')
+        self.assertEqual(get_logs(), [])
+
+    def test_rollback(self):
+        book = Book.objects.create(name='a')
+        models.Log.objects.all().delete()
+
+        with transaction.atomic():
+            book.name = 'saved'
+            book.save()
+            try:
+                with transaction.atomic():
+                    Book.objects.create(name='rolled back')
+                    raise ValueError
+            except ValueError:
+                pass
+
+        try:
+            with transaction.atomic():
+                book.delete()
+                raise ValueError
+        except ValueError:
+            pass
+
+        self.assertEqual(get_logs(), [(consts.ACTION_UPDATED, Book.LOG_NAME, 'saved')])
+
+    def test_reverse_many_to_many(self):
+        book = Book.objects.create(name='a')
+        tag = Tag.objects.create(name='tag')
+        models.Log.objects.all().delete()
+
+        tag.book_set.add(book)
+        log = models.Log.objects.get()
+        self.assertEqual((log.action, log.object_id), (consts.ACTION_UPDATED, book.id))
+        self.assertEqual(log.get_object_data()['tags'], [tag.id])
+
+    def test_errors_handled(self):
+        book = Book.objects.create(name='a')
+        tag = Tag.objects.create(name='tag')
+        handler = capture.get_handler()
+
+        with mock.patch.object(handler, 'handleError') as handle_error:
+            with mock.patch.object(tools, 'save_logs', side_effect=RuntimeError):
+                book.name = 'b'
+                book.save()
+            self.assertEqual(handle_error.call_count, 1)
+
+            # fetching of objects changed through reverse relation
+            with mock.patch.object(Book._default_manager, 'filter', side_effect=RuntimeError):
+                tag.book_set.add(book)
+            self.assertEqual(handle_error.call_count, 2)
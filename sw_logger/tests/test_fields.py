@@ -0,0 +1,54 @@
+import json
+from unittest import mock
+from django.test import TestCase, override_settings
+
+from sw_logger import serializers
+from sw_logger.fields import LogJSONField, MARK
+from sw_logger.models import Log
+
+DATA = {'name': 'x' * 100, 'items': list(range(20))}
+
+
+class LogJSONFieldTestCase(TestCase):
+    def create_log(self, extra) -> Log:
+        return Log.objects.create(message='message', extra=extra)
+
+    def test_serialized_once(self):
+        with override_settings(SW_LOGGER_COMPRESS_THRESHOLD=10), \
+                mock.patch('sw_logger.serializers.dumps', side_effect=serializers.dumps) as dumps:
+            self.create_log(DATA)
+        self.assertEqual(dumps.call_count, 1)
+
+    @override_settings(SW_LOGGER_JSON_BACKEND='orjson')
+    def test_backend_used(self):
+        with mock.patch('sw_logger.serializers.dumps', return_value='{"a": 1}'):
+            log = self.create_log(DATA)
+        log.refresh_from_db()
+        self.assertEqual(log.extra, {'a': 1})
+
+    @override_settings(SW_LOGGER_COMPRESS_THRESHOLD=100)
+    def test_compressed(self):
+        stored = LogJSONField.to_json(DATA)
+        self.assertTrue(json.loads(stored).startswith(MARK))
+        log = self.create_log(DATA)
+        log.refresh_from_db()
+        self.assertEqual(log.extra, DATA)
+        self.assertFalse(Log.objects.filter(extra__items__1=1).exists())
+
+    @override_settings(SW_LOGGER_COMPRESS_THRESHOLD=100)
+    def test_not_compressed(self):
+        log = self.create_log({'id': 1})
+        log.refresh_from_db()
+        self.assertEqual(log.extra, {'id': 1})
+        self.assertTrue(Log.objects.filter(extra__id=1).exists())
+
+    def test_marked_string(self):
+        log = self.create_log(MARK + 'zlib:text')
+        log.refresh_from_db()
+        self.assertEqual(log.extra, MARK + 'zlib:text')
+
+    def test_null(self):
+        log = self.create_log(None)
+        log.refresh_from_db()
+        self.assertIsNone(log.extra)
+        self.assertTrue(Log.objects.filter(extra__isnull=True).exists())
@@ -0,0 +1,93 @@
+import asyncio
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TransactionTestCase, RequestFactory
+
+from sw_logger import consts
+from sw_logger import context
+from sw_logger import handlers
+from sw_logger import models
+from sw_logger import throttling
+from .utils import make_record
+
+
+def get_messages() -> list:
+    return list(models.Log.objects.order_by('id').values_list('message', flat=True))
+
+
+class QueuedDbHandlerTestCase(TransactionTestCase):
+    def make_stopped_handler(self, **kwargs) -> handlers.QueuedDbHandler:
+        """
+            handler with writer not started, so records stay in queue
+        """
+        handler = handlers.QueuedDbHandler(**kwargs)
+        patcher = mock.patch.object(handler, '_start_writer')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return handler
+
+    def test_close_saves_queued(self):
+        handler = handlers.QueuedDbHandler(flush_interval=60)
+        for i in range(5):
+            handler.handle(make_record('message %s' % i))
+        handler.close()
+        self.assertEqual(get_messages(), ['message %s' % i for i in range(5)])
+
+    def test_overflow_block(self):
+        handler = handlers.QueuedDbHandler(queue_size=2, batch_size=1, flush_interval=0.01)
+        for i in range(20):
+            handler.handle(make_record('message %s' % i))
+        handler.close()
+        self.assertEqual(get_messages(), ['message %s' % i for i in range(20)])
+
+    def test_overflow_sync(self):
+        handler = self.make_stopped_handler(queue_size=2, overflow=consts.OVERFLOW_SYNC)
+        for i in range(4):
+            handler.handle(make_record('message %s' % i))
+        # records not fitted in queue are saved at once
+        self.assertEqual(get_messages(), ['message 2', 'message 3'])
+        self.assertEqual(handler.queue.qsize(), 2)
+
+    def test_overflow_drop_oldest(self):
+        handler = self.make_stopped_handler(queue_size=3, overflow=consts.OVERFLOW_DROP_OLDEST)
+        for i in range(5):
+            handler.handle(make_record('message %s' % i))
+        self.assertEqual([log.message for log, _ in handler.queue.queue], ['message 2', 'message 3', 'message 4'])
+
+    def test_drop_oldest_keeps_repeats_and_stop(self):
+        handler = self.make_stopped_handler(queue_size=3, overflow=consts.OVERFLOW_DROP_OLDEST)
+        record = make_record()
+        entry = throttling.DedupEntry(handler.make_log(record), record)
+        handler.queue.put(None)
+        handler.queue.put(entry)
+        handler.handle(make_record('first'))
+        handler.handle(make_record('second'))
+
+        self.assertEqual(list(handler.queue.queue)[:2], [None, entry])
+        self.assertEqual(list(handler.queue.queue)[2][0].message, 'second')
+
+        # only service items in queue - new record is dropped
+        handler.queue.queue.pop()
+        handler.queue.put(entry)
+        handler.handle(make_record('third'))
+        self.assertEqual(list(handler.queue.queue), [None, entry, entry])
+
+
+class AsyncDbHandlerTestCase(TransactionTestCase):
+    def test_current_request(self):
+        request = RequestFactory().get('/orders/')
+        request.user = User.objects.create(username='user')
+        handler = handlers.AsyncDbHandler()
+
+        async def view():
+            token = context.set_request(request)
+            try:
+                handler.handle(make_record('in loop'))
+            finally:
+                context.reset_request(token)
+
+        asyncio.run(view())
+        handler.close()
+
+        log = models.Log.objects.get()
+        self.assertEqual((log.message, log.username, log.http_path), ('in loop', 'user', '/orders/'))
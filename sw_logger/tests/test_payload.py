@@ -0,0 +1,84 @@
+import json
+from django.test import TestCase, RequestFactory, override_settings
+
+from sw_logger import handlers
+from sw_logger import models
+from sw_logger import payload
+from .utils import make_record
+
+
+class PayloadPolicyTestCase(TestCase):
+    def setUp(self):
+        payload.reset_counters()
+        self.addCleanup(payload.reset_counters)
+
+    def test_empty_policy(self):
+        value = {'password': 'x'}
+        self.assertIs(payload.PayloadPolicy().apply(value, 'extra'), value)
+
+    def test_depth_length_scrub(self):
+        policy = payload.PayloadPolicy(max_depth=2, max_length=3, scrub_keys=payload.SENSITIVE_KEYS)
+        value = {'Password': 'x', 'list': [1, 2, 3, 4, 5], 'nested': {'a': {'b': 1}}, 'd': 1, 'e': 2}
+        self.assertEqual(policy.apply(value, 'extra'), {
+            'Password': payload.SCRUBBED,
+            'list': [1, 2, 3, payload.TRUNCATED],
+            'nested': {'a': payload.TRUNCATED},
+            payload.TRUNCATED_KEY: 2,
+        })
+        self.assertEqual(payload.get_counters(), {
+            ('extra', payload.REASON_DEPTH): 1,
+            ('extra', payload.REASON_LENGTH): 1,
+            ('extra', payload.REASON_SCRUBBED): 1,
+        })
+        # source value is not changed
+        self.assertEqual(value['Password'], 'x')
+
+    def test_exact_keys_scrubbed(self):
+        policy = payload.PayloadPolicy(scrub_keys=payload.SENSITIVE_KEYS)
+        value = {'API_KEY': 'x', 'password': 'x', 'session_id': 1, 'csrf_token': 't', 'password_changed': True}
+        self.assertEqual(policy.apply(value, 'extra'), {
+            'API_KEY': payload.SCRUBBED, 'password': payload.SCRUBBED,
+            'session_id': 1, 'csrf_token': 't', 'password_changed': True,
+        })
+
+    def test_max_bytes(self):
+        policy = payload.PayloadPolicy(max_bytes=100)
+        value = {'text': 'я' * 100, 'items': list(range(100))}
+        result = policy.apply(value, 'extra')
+
+        self.assertTrue(result['text'].endswith(payload.TRUNCATED))
+        self.assertLessEqual(len(json.dumps(result, ensure_ascii=False).encode('utf-8')), 150)
+        self.assertEqual(payload.get_counters(), {('extra', payload.REASON_BYTES): 1})
+
+    def test_small_value_not_changed(self):
+        policy = payload.PayloadPolicy(max_bytes=1000, max_depth=5, max_length=10)
+        value = {'a': [1, 'b', {'c': None}], 'd': 1.5}
+        self.assertEqual(policy.apply(value, 'extra'), value)
+        self.assertEqual(payload.get_counters(), {})
+
+
+class HandlerPayloadTestCase(TestCase):
+    @override_settings(SW_LOGGER_PAYLOAD_MAX_BYTES={'extra': 20})
+    def test_extra(self):
+        handlers.DbHandler().handle(make_record(extra={'text': 'x' * 100}))
+
+        extra = models.Log.objects.get().extra
+        self.assertTrue(extra['text'].endswith(payload.TRUNCATED))
+        self.assertLess(len(extra['text']), 100)
+
+    @override_settings(SW_LOGGER_LOG_REQUEST_PARAMS=True)
+    def test_request_post_not_scrubbed_by_default(self):
+        request = RequestFactory().post('/login/', {'username': 'user', 'password': 'secret'})
+        handlers.DbHandler().handle(make_record(request=request))
+
+        self.assertEqual(models.Log.objects.get().http_request_post, {'username': 'user', 'password': 'secret'})
+
+    @override_settings(SW_LOGGER_LOG_REQUEST_PARAMS=True, SW_LOGGER_SCRUB_KEYS=payload.SENSITIVE_KEYS)
+    def test_request_post_scrubbed(self):
+        request = RequestFactory().post('/login/', {'username': 'user', 'password': 'secret'})
+        handlers.DbHandler().handle(make_record(request=request))
+
+        self.assertEqual(
+            models.Log.objects.get().http_request_post,
+            {'username': 'user', 'password': payload.SCRUBBED},
+        )
@@ -0,0 +1,80 @@
+from datetime import timedelta
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test import SimpleTestCase, TestCase, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from sw_logger import admin as sw_logger_admin
+from sw_logger import models
+from sw_logger import routers
+from sw_logger import views
+from .models import Book
+
+
+class LogRouterTestCase(SimpleTestCase):
+    def setUp(self):
+        self.router = routers.LogRouter()
+
+    def test_default_routing(self):
+        self.assertIsNone(self.router.db_for_read(models.Log))
+        self.assertIsNone(self.router.db_for_write(models.Log))
+        self.assertIsNone(self.router.allow_migrate('default', 'sw_logger', 'log'))
+
+    @override_settings(SW_LOGGER_DATABASE='logs')
+    def test_log_models(self):
+        for model in (models.Log, models.Checkpoint, models.LogStat):
+            self.assertEqual(self.router.db_for_read(model), 'logs')
+            self.assertEqual(self.router.db_for_write(model), 'logs')
+        self.assertTrue(self.router.allow_migrate('logs', 'sw_logger', 'log'))
+        self.assertFalse(self.router.allow_migrate('default', 'sw_logger', 'log'))
+
+    @override_settings(SW_LOGGER_DATABASE='logs')
+    def test_other_models(self):
+        self.assertIsNone(self.router.db_for_read(Book))
+        self.assertIsNone(self.router.db_for_write(Book))
+        self.assertIsNone(self.router.allow_migrate('default', 'tests', 'book'))
+        self.assertIsNone(self.router.allow_migrate('logs', 'tests', 'book'))
+
+    def test_read_database(self):
+        self.assertIsNone(routers.get_read_database())
+        with override_settings(SW_LOGGER_DATABASE='logs'):
+            self.assertEqual(routers.get_read_database(), 'logs')
+            with override_settings(SW_LOGGER_READ_DATABASE='replica'):
+                self.assertEqual(routers.get_read_database(), 'replica')
+                self.assertEqual(routers.get_database(), 'logs')
+
+
+@override_settings(SW_LOGGER_READ_DATABASE='replica')
+class ReadDatabaseTestCase(TestCase):
+    databases = {'default', 'replica'}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        models.Log.objects.create(message='default', created=timezone.now())
+        models.Log.objects.using('replica').create(message='replica', created=timezone.now())
+
+    def get_admin_queryset(self, method: str):
+        request = getattr(RequestFactory(), method)('/admin/sw_logger/log/')
+        request.user = self.user
+        return sw_logger_admin.Log(models.Log, admin.site).get_queryset(request)
+
+    def test_admin(self):
+        self.assertEqual(self.get_admin_queryset('get').db, 'replica')
+        # changes - from write database
+        self.assertEqual(self.get_admin_queryset('post').db, 'default')
+
+    def test_view(self):
+        now = timezone.now()
+        request = RequestFactory().get('/log/', {
+            'datetime_from': (now - timedelta(days=1)).strftime('%Y-%m-%d %H:%M'),
+            'datetime_to': (now + timedelta(days=1)).strftime('%Y-%m-%d %H:%M'),
+        })
+        view = views.Log(request=request, kwargs={})
+        qs = view.get_queryset()
+        self.assertEqual(qs.db, 'replica')
+        with CaptureQueriesContext(connections['replica']) as queries:
+            self.assertEqual([log.message for log in qs], ['replica'])
+        self.assertEqual(len(queries), 1)
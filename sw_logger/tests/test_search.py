@@ -0,0 +1,70 @@
+from unittest import skipUnless
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from sw_logger import models
+from sw_logger import search
+
+
+class SearchMixin:
+    backend_class = None
+
+    def setUp(self):
+        self.backend = self.backend_class()
+        self.backend.setup()
+        models.Log.objects.create(message='Payment failed', func_name='f', extra={'reason': 'gateway timeout'})
+        models.Log.objects.create(message='Order created', func_name='f', object_data={'name': 'red book'})
+        models.Log.objects.create(message='Order paid', func_name='f')
+
+    def search(self, query: str) -> list:
+        qs = self.backend.search(models.Log.objects.all(), query)
+        return sorted(qs.values_list('message', flat=True))
+
+    def test_message(self):
+        self.assertEqual(self.search('order'), ['Order created', 'Order paid'])
+        self.assertEqual(self.search('payment'), ['Payment failed'])
+        self.assertEqual(self.search('missing'), [])
+
+
+class DefaultSearchTestCase(SearchMixin, TestCase):
+    backend_class = search.SearchBackend
+
+    def test_substring(self):
+        self.assertEqual(self.search('ymen'), ['Payment failed'])
+
+
+class FullTextMixin(SearchMixin):
+    def test_json_fields(self):
+        self.assertEqual(self.search('timeout'), ['Payment failed'])
+        self.assertEqual(self.search('red book'), ['Order created'])
+        self.assertEqual(self.search('order book'), ['Order created'])
+
+    def test_query_syntax_escaped(self):
+        self.assertEqual(self.search('"order AND -paid*'), [])
+        self.assertEqual(self.search('order OR'), [])
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite only')
+class SqliteFtsSearchTestCase(FullTextMixin, TestCase):
+    backend_class = search.SqliteFtsSearchBackend
+
+    def test_synced_with_table(self):
+        log = models.Log.objects.get(message='Order paid')
+        log.message = 'Refund paid'
+        log.save()
+        models.Log.objects.filter(message='Order created').delete()
+
+        self.assertEqual(self.search('order'), [])
+        self.assertEqual(self.search('refund'), ['Refund paid'])
+        self.assertEqual(self.search('timeout'), ['Payment failed'])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'PostgreSQL only')
+class PostgresSearchTestCase(FullTextMixin, TestCase):
+    backend_class = search.PostgresSearchBackend
+
+
+@override_settings(SW_LOGGER_SEARCH_BACKEND='sw_logger.search.SqliteFtsSearchBackend')
+class GetSearchBackendTestCase(TestCase):
+    def test_setting(self):
+        self.assertIsInstance(search.get_search_backend(), search.SqliteFtsSearchBackend)
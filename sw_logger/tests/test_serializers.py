@@ -0,0 +1,64 @@
+import json
+import importlib.util
+from django.test import TestCase, override_settings
+
+from sw_logger import consts
+from sw_logger import serializers
+from sw_logger import tools
+from .models import Author, Book, Tag
+
+DATA = {
+    'id': 1,
+    'name': 'Книга "quoted"\n\t\\',
+    'price': ['10.50'],
+    'published': '2024-01-31',
+    'rating': 4.25,
+    'big': 2 ** 53,
+    'active': True,
+    'deleted': None,
+    'tags': [1, 2, 3],
+    'nested': {'a': [{'b': None}], 'emoji': '😀'},
+}
+
+
+class DumpsTestCase(TestCase):
+    def assert_equivalent(self, backend: str):
+        if backend != consts.JSON_BACKEND_JSON and importlib.util.find_spec(backend) is None:
+            self.skipTest('%s is not installed' % backend)
+
+        with override_settings(SW_LOGGER_JSON_BACKEND=backend):
+            result = serializers.dumps(DATA)
+        self.assertIsInstance(result, str)
+        self.assertEqual(json.loads(result), DATA)
+        self.assertEqual(json.loads(result), json.loads(json.dumps(DATA)))
+        with override_settings(SW_LOGGER_JSON_BACKEND=backend):
+            self.assertEqual(json.loads(serializers.dumps({1: 'a'})), {'1': 'a'})
+
+    def test_json(self):
+        self.assert_equivalent(consts.JSON_BACKEND_JSON)
+
+    def test_orjson(self):
+        self.assert_equivalent(consts.JSON_BACKEND_ORJSON)
+
+    def test_msgspec(self):
+        self.assert_equivalent(consts.JSON_BACKEND_MSGSPEC)
+
+
+class ModelToDictTestCase(TestCase):
+    def setUp(self):
+        self.book = Book.objects.create(name='book', author=Author.objects.create(name='author'))
+        self.book.tags.set([Tag.objects.create(name='tag %s' % i) for i in range(2)])
+
+    def test_same_as_tools(self):
+        self.assertEqual(serializers.model_to_dict(self.book), tools.model_to_dict(self.book))
+
+    def test_prefetched(self):
+        book = Book.objects.prefetch_related('tags').get(id=self.book.id)
+        with self.assertNumQueries(0):
+            obj_dict = serializers.model_to_dict(book)
+        self.assertEqual(obj_dict, tools.model_to_dict(self.book))
+
+    def test_not_saved(self):
+        self.assertEqual(serializers.model_to_dict(Book(name='new')), {
+            'id': None, 'name': 'new', 'author': None, 'tags': [],
+        })
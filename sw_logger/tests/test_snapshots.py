@@ -0,0 +1,109 @@
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from sw_logger import handlers
+from sw_logger import history
+from sw_logger import models
+from sw_logger import serializers
+from sw_logger import snapshots
+from sw_logger import tools
+from .models import Author, Book
+from .utils import make_record
+
+
+class DeltaMixin:
+    def setUp(self):
+        snapshots._cache = None
+        self.addCleanup(setattr, snapshots, '_cache', None)
+        self.book = Book.objects.create(name='a', author=Author.objects.create(name='author'))
+
+    def log_names(self, handler, names):
+        for name in names:
+            self.book.name = name
+            self.book.save()
+            handler.handle(make_record(object=self.book))
+
+    def get_history(self):
+        logs = models.Log.objects.filter(object_id=self.book.id).order_by('id')
+        return [(log.object_data_delta, log.get_object_data()['name']) for log in logs]
+
+
+@override_settings(SW_LOGGER_KEYFRAME_INTERVAL=3)
+class DeltaTestCase(DeltaMixin, TestCase):
+    def test_keyframes(self):
+        self.log_names(handlers.DbHandler(), ['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual(self.get_history(), [
+            (False, 'a'), (True, 'b'), (True, 'c'), (False, 'd'), (True, 'e'),
+        ])
+
+    def test_cache_miss_keyframe(self):
+        handler = handlers.DbHandler()
+        self.log_names(handler, ['a', 'b'])
+        # other process (or restarted one) doesn't know previous record - full data is stored
+        snapshots.get_cache().clear()
+        self.log_names(handler, ['c'])
+        self.assertEqual(self.get_history(), [(False, 'a'), (True, 'b'), (False, 'c')])
+
+    @override_settings(SW_LOGGER_STORE_CHANGES=True)
+    def test_changes_without_cache(self):
+        handler = handlers.DbHandler()
+        self.log_names(handler, ['a'])
+        snapshots.get_cache().clear()
+        self.log_names(handler, ['b'])
+
+        log = models.Log.objects.order_by('id').last()
+        self.assertEqual(log.changes, ['name'])
+        self.assertFalse(log.object_data_delta)
+
+
+@override_settings(SW_LOGGER_KEYFRAME_INTERVAL=5)
+class ProcessesDeltaTestCase(DeltaMixin, TestCase):
+    def test_interleaved(self):
+        # two processes (own snapshot caches) change own copies of object
+        processes = [
+            (snapshots.ObjectStateCache(100), Book.objects.get(id=self.book.id)),
+            (snapshots.ObjectStateCache(100), Book.objects.get(id=self.book.id)),
+        ]
+        handler = handlers.DbHandler()
+        authors = [Author.objects.create(name='author %s' % i) for i in range(2)]
+
+        logged = []
+        for i in range(8):
+            cache, book = processes[i % 2]
+            if i % 2:
+                book.author = authors[i % 4 // 2]
+            else:
+                book.name = 'name %s' % i
+            snapshots._cache = cache
+            handler.handle(make_record(object=book))
+            logged.append(serializers.model_to_dict(book))
+
+        logs = list(models.Log.objects.filter(object_id=self.book.id).order_by('id'))
+        self.assertEqual([log.object_data_delta for log in logs], [False, False] + [True] * 6)
+        self.assertEqual([log.get_object_data() for log in logs], logged)
+
+        # with previous records prefetched
+        logs = tools.prefetch_changes(models.Log.objects.filter(object_id=self.book.id).order_by('-id'))
+        self.assertEqual([log.get_object_data() for log in logs], logged[::-1])
+
+        page = history.ObjectHistory.for_object(self.book).page(per_page=3)
+        self.assertEqual([log.get_object_data() for log in page], logged[:-4:-1])
+
+
+class QueuedDeltaTestCase(DeltaMixin, TransactionTestCase):
+    @override_settings(SW_LOGGER_KEYFRAME_INTERVAL=5)
+    def test_value_returned_back(self):
+        # records are not in db yet, when next records of object are logged
+        handler = handlers.QueuedDbHandler(flush_interval=5)
+        self.log_names(handler, ['a', 'b', 'a', 'c'])
+        handler.close()
+        self.assertEqual(self.get_history(), [(False, 'a'), (True, 'b'), (True, 'a'), (True, 'c')])
+
+    @override_settings(SW_LOGGER_STORE_CHANGES=True)
+    def test_changes_value_returned_back(self):
+        handler = handlers.QueuedDbHandler(flush_interval=5)
+        self.log_names(handler, ['a', 'b', 'a'])
+        handler.close()
+
+        logs = models.Log.objects.filter(object_id=self.book.id).order_by('id')
+        self.assertEqual([log.changes for log in logs], [['id', 'name', 'author', 'tags'], ['name'], ['name']])
+        self.assertEqual([log.object_data['name'] for log in logs], ['a', 'b', 'a'])
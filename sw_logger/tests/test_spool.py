@@ -0,0 +1,61 @@
+import os
+import json
+import shutil
+import tempfile
+from django.test import TestCase
+
+from sw_logger import models
+from sw_logger import spool
+from sw_logger.handlers import SpoolHandler
+from .utils import make_record
+
+
+class CollectTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def test_records_saved_once(self):
+        handler = SpoolHandler(directory=self.directory)
+        for i in range(5):
+            handler.handle(make_record('message %s' % i))
+
+        self.assertEqual(spool.collect(self.directory, batch_size=2), (5, 0))
+        self.assertEqual(spool.collect(self.directory), (0, 0))
+        handler.close()
+
+        self.assertEqual(
+            sorted(models.Log.objects.values_list('message', flat=True)),
+            ['message %s' % i for i in range(5)],
+        )
+
+    def test_broken_lines_skipped(self):
+        good = json.dumps({'message': 'ok', 'func_name': 'f', 'level': 'INFO'})
+        lines = [
+            good,
+            'not json',
+            '[1, 2]',
+            json.dumps({'message': 'bad date', 'created': 'garbage'}),
+            json.dumps({'message': 'bad int', 'user_id': 'abc'}),
+            good,
+        ]
+        path = os.path.join(self.directory, '%s-1.spool' % os.getpid())
+        with open(path, 'w') as file:
+            file.write('\n'.join(lines) + '\n')
+
+        saved, skipped, offset = spool.collect_segment(path)
+        self.assertEqual((saved, skipped), (2, 4))
+        self.assertEqual(offset, os.path.getsize(path))
+        self.assertEqual(list(models.Log.objects.values_list('message', flat=True)), ['ok', 'ok'])
+
+    def test_partial_last_line_not_read(self):
+        path = os.path.join(self.directory, '%s-1.spool' % os.getpid())
+        with open(path, 'w') as file:
+            file.write(json.dumps({'message': 'ok'}) + '\n{"message": "par')
+
+        saved, skipped, offset = spool.collect_segment(path)
+        self.assertEqual((saved, skipped), (1, 0))
+        with open(path, 'a') as file:
+            file.write('tial"}\n')
+        self.assertEqual(spool.collect_segment(path)[:2], (1, 0))
+        self.assertEqual(models.Log.objects.filter(message='partial').count(), 1)
@@ -0,0 +1,86 @@
+import datetime
+from django.test import TestCase
+
+from sw_logger import models
+from sw_logger import stats
+
+DAY = datetime.datetime(2024, 1, 31, tzinfo=datetime.timezone.utc)
+
+
+def create_logs(hour: int, level: str, count: int, user_id=None) -> None:
+    models.Log.objects.bulk_create([
+        models.Log(message='m', level=level, user_id=user_id, created=DAY + datetime.timedelta(hours=hour, minutes=i))
+        for i in range(count)
+    ])
+
+
+def get_counts() -> dict:
+    return {
+        (stat.bucket.hour, stat.level, stat.user_id): stat.count
+        for stat in models.LogStat.objects.all()
+    }
+
+
+class RollupTestCase(TestCase):
+    def setUp(self):
+        create_logs(0, 'INFO', 3)
+        create_logs(0, 'ERROR', 2, user_id=1)
+        create_logs(5, 'INFO', 4)
+
+    def test_buckets(self):
+        self.assertEqual(stats.rollup(), 9)
+        self.assertEqual(get_counts(), {(0, 'INFO', None): 3, (0, 'ERROR', 1): 2, (5, 'INFO', None): 4})
+
+    def test_idempotent(self):
+        stats.rollup()
+        counts = get_counts()
+        self.assertEqual(stats.rollup(), 0)
+        self.assertEqual(stats.rollup(), 0)
+        self.assertEqual(get_counts(), counts)
+
+    def test_added_to_existing_bucket(self):
+        stats.rollup()
+        create_logs(0, 'INFO', 2)
+        create_logs(1, 'INFO', 1)
+        self.assertEqual(stats.rollup(), 3)
+        self.assertEqual(get_counts(), {
+            (0, 'INFO', None): 5, (0, 'ERROR', 1): 2, (1, 'INFO', None): 1, (5, 'INFO', None): 4,
+        })
+        self.assertEqual(models.LogStat.objects.count(), 4)
+
+    def test_batches(self):
+        self.assertEqual(stats.rollup(batch_size=2), 9)
+        self.assertEqual(get_counts(), {(0, 'INFO', None): 3, (0, 'ERROR', 1): 2, (5, 'INFO', None): 4})
+        self.assertEqual(stats.rollup(batch_size=2), 0)
+
+
+class GetStatsTestCase(TestCase):
+    def setUp(self):
+        create_logs(0, 'INFO', 3)
+        create_logs(0, 'ERROR', 2, user_id=1)
+        create_logs(5, 'INFO', 4)
+
+    def assert_stats(self):
+        rows = sorted(stats.get_stats(['level']), key=lambda row: (row['bucket'], row['level']))
+        self.assertEqual(rows, [
+            {'bucket': DAY, 'level': 'ERROR', 'count': 2},
+            {'bucket': DAY, 'level': 'INFO', 'count': 3},
+            {'bucket': DAY + datetime.timedelta(hours=5), 'level': 'INFO', 'count': 4},
+        ])
+        self.assertEqual(stats.get_stats(period=stats.PERIOD_DAY), [{'bucket': DAY, 'count': 9}])
+        self.assertEqual(stats.get_stats(level='INFO', period=stats.PERIOD_DAY), [{'bucket': DAY, 'count': 7}])
+        self.assertEqual(stats.get_stats(user_id=1), [{'bucket': DAY, 'count': 2}])
+
+    def test_recent(self):
+        self.assert_stats()
+
+    def test_rolled_up(self):
+        stats.rollup()
+        self.assert_stats()
+        self.assertEqual(stats.get_stats(include_recent=False, period=stats.PERIOD_DAY), [{'bucket': DAY, 'count': 9}])
+
+    def test_partially_rolled_up(self):
+        stats.rollup()
+        create_logs(0, 'INFO', 1)
+        self.assertEqual(stats.get_stats(period=stats.PERIOD_DAY), [{'bucket': DAY, 'count': 10}])
+        self.assertEqual(stats.get_stats(include_recent=False, period=stats.PERIOD_DAY), [{'bucket': DAY, 'count': 9}])
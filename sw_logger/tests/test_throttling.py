@@ -0,0 +1,92 @@
+import time
+import threading
+from unittest import mock
+from django.test import TestCase, TransactionTestCase
+
+from sw_logger import handlers
+from sw_logger import models
+from sw_logger import tools
+from .models import Book
+from .utils import make_record
+
+
+def get_repeats(msg: str = 'message') -> list:
+    return list(models.Log.objects.filter(message=msg).values_list('repeat_count', flat=True))
+
+
+class ThrottleTestCase(TestCase):
+    def test_rate_limit(self):
+        handler = handlers.DbHandler(rate_limits={'app:INFO': (0, 5)})
+        for i in range(20):
+            handler.handle(make_record('message %s' % i))
+        self.assertEqual(models.Log.objects.count(), 5)
+
+    def test_sampling_keeps_object_changes(self):
+        book = Book.objects.create(name='book')
+        handler = handlers.DbHandler(sampling={'*': 0.0})
+        handler.handle(make_record())
+        handler.handle(make_record('changed', object=book, action='updated'))
+        self.assertEqual(list(models.Log.objects.values_list('message', flat=True)), ['changed'])
+
+    def test_dedup(self):
+        handler = handlers.DbHandler(dedup_window=60)
+        for _ in range(10):
+            handler.handle(make_record())
+        handler.handle(make_record('other'))
+        self.assertEqual(get_repeats(), [1])
+
+        handler.flush()
+        self.assertEqual(get_repeats(), [10])
+        self.assertIsNotNone(models.Log.objects.get(message='message').last_seen)
+        self.assertEqual(get_repeats('other'), [1])
+
+    def test_dedup_window_expired(self):
+        handler = handlers.DbHandler(dedup_window=0.1)
+        for _ in range(3):
+            handler.handle(make_record())
+        time.sleep(0.15)
+        handler.handle(make_record())
+        handler.flush()
+        self.assertEqual(get_repeats(), [3, 1])
+
+
+class QueuedDedupTestCase(TransactionTestCase):
+    def test_repeats_saved_after_insert(self):
+        handler = handlers.QueuedDbHandler(dedup_window=60, flush_interval=0.05)
+        for _ in range(50):
+            handler.handle(make_record())
+        handler.flush()
+        self.assertEqual(get_repeats(), [50])
+        handler.close()
+
+    def test_repeats_without_pk(self):
+        # backends, which don't set primary keys on bulk insert
+        def save_logs(logs):
+            save_logs_orig(logs)
+            for log in logs:
+                log.pk = None
+
+        save_logs_orig = tools.save_logs
+        handler = handlers.QueuedDbHandler(dedup_window=60, flush_interval=0.05)
+        with mock.patch.object(tools, 'save_logs', save_logs):
+            for _ in range(7):
+                handler.handle(make_record())
+            handler.close()
+        self.assertEqual(get_repeats(), [7])
+
+    def test_expired_repeats_saved_by_writer(self):
+        saved = threading.Event()
+        save_entry_repeats = handlers.DbHandler._save_entry_repeats
+
+        def save_and_notify(handler_, entry):
+            save_entry_repeats(handler_, entry)
+            saved.set()
+
+        handler = handlers.QueuedDbHandler(dedup_window=0.1, flush_interval=0.05)
+        with mock.patch.object(handlers.DbHandler, '_save_entry_repeats', save_and_notify):
+            for _ in range(5):
+                handler.handle(make_record())
+            # without new records and flush
+            self.assertTrue(saved.wait(2))
+        self.assertEqual(get_repeats(), [5])
+        handler.close()
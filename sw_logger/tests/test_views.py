@@ -0,0 +1,68 @@
+import json
+from django.http import Http404
+from django.test import TestCase, RequestFactory, override_settings
+
+from sw_logger import handlers
+from sw_logger import metrics
+from sw_logger import payload
+from sw_logger import views
+from .models import Book
+from .utils import make_record
+
+
+class WrongDateTestCase(TestCase):
+    def test_stats(self):
+        request = RequestFactory().get('/stats/', {'date_from': '2024-13-01T00:00'})
+        response = views.Stats.as_view()(request)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', json.loads(response.content))
+
+    def test_object_history(self):
+        book = Book.objects.create(name='book')
+        view = views.ObjectHistory.as_view(template_name='unused.html')
+        for at in ('2024-13-01T00:00', 'yesterday'):
+            request = RequestFactory().get('/history/', {'at': at})
+            with self.assertRaises(Http404):
+                view(request, object_name=Book.LOG_NAME, object_id=book.id)
+
+
+class MetricsTestCase(TestCase):
+    def setUp(self):
+        metrics._backend = None
+        payload.reset_counters()
+        self.addCleanup(setattr, metrics, '_backend', None)
+        self.addCleanup(payload.reset_counters)
+
+    def get_metrics(self) -> str:
+        response = views.Metrics.as_view()(RequestFactory().get('/metrics/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode('utf-8')
+
+    def test_disabled(self):
+        self.assertEqual(self.get_metrics(), '')
+
+    @override_settings(SW_LOGGER_METRICS_BACKEND='sw_logger.metrics.PrometheusMetrics',
+                       SW_LOGGER_PAYLOAD_MAX_BYTES={'extra': 20})
+    def test_prometheus(self):
+        handler = handlers.DbHandler()
+        handler.handle(make_record())
+        handler.handle(make_record(extra={'text': 'x' * 100}))
+
+        lines = self.get_metrics().splitlines()
+        self.assertIn('# TYPE sw_logger_records_saved_total counter', lines)
+        self.assertIn('sw_logger_records_saved_total 2', lines)
+        self.assertIn('# TYPE sw_logger_stage_seconds summary', lines)
+        self.assertIn('sw_logger_stage_seconds_count{stage="write"} 2', lines)
+        self.assertIn('# TYPE sw_logger_payload_truncated_total counter', lines)
+        self.assertIn('sw_logger_payload_truncated_total{field="extra",reason="bytes"} 1', lines)
+        for line in lines:
+            if not line.startswith('#'):
+                self.assertRegex(line, r'^sw_logger_\w+(\{(\w+="[^"]*",?)+\})? [0-9.e-]+$')
+
+    def test_labels_escaped(self):
+        text = metrics.format_metrics({(metrics.ERRORS, (('reason', 'a "b"\n'),)): 1})
+        self.assertEqual(text, (
+            '# TYPE sw_logger_errors_total counter\n'
+            'sw_logger_errors_total{reason="a \\"b\\"\\n"} 1\n'
+        ))
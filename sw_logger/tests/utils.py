@@ -0,0 +1,10 @@
+import logging
+
+
+def make_record(msg: str = 'message', level: int = logging.INFO, **extra) -> logging.LogRecord:
+    """
+        log record of "app" logger, extra - record attributes (object, action, request, extra)
+    """
+    record = logging.LogRecord('app', level, __file__, 1, msg, None, None)
+    record.__dict__.update(extra)
+    return record
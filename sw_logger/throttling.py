@@ -0,0 +1,157 @@
+import time
+import random
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple, List
+from logging import LogRecord
+
+from . import consts
+
+ANY_RULE = '*'
+
+
+def get_rule_key(rules: dict, record: LogRecord) -> Optional[str]:
+    """
+        key of most specific rule for record. Keys are "<logger>:<LEVEL>", "<logger>", "<LEVEL>" or "*",
+        logger rules are applied to child loggers too ("app" to "app.views")
+    """
+    logger_names = []
+    name = record.name
+    while name:
+        logger_names.append(name)
+        name = name.rpartition('.')[0]
+
+    for logger_name in logger_names:
+        key = '%s:%s' % (logger_name, record.levelname)
+        if key in rules:
+            return key
+    for logger_name in logger_names:
+        if logger_name in rules:
+            return logger_name
+    if record.levelname in rules:
+        return record.levelname
+    if ANY_RULE in rules:
+        return ANY_RULE
+
+
+def is_audit_record(record: LogRecord) -> bool:
+    """
+        object changes log (action with object) - never sampled, limited or deduplicated
+    """
+    has_object = hasattr(record, 'object') or getattr(record, 'object_id', None) is not None
+    return has_object and getattr(record, 'action', None) in dict(consts.ACTION_CHOICES)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def consume(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class Throttle:
+    """
+        Sampling and rate limits of log records.
+            sampling - {rule key: share of saved records (0..1)}
+            rate_limits - {rule key: (records per second, burst)}
+        Rule keys - see get_rule_key. Rate limit bucket is common for all records of rule.
+    """
+    def __init__(self, sampling: Optional[Dict[str, float]] = None,
+                 rate_limits: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.sampling = sampling or {}
+        self.rate_limits = rate_limits or {}
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def allow(self, record: LogRecord) -> bool:
+        key = get_rule_key(self.sampling, record)
+        if key is not None and random.random() >= self.sampling[key]:
+            return False
+
+        key = get_rule_key(self.rate_limits, record)
+        if key is None:
+            return True
+
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = TokenBucket(*self.rate_limits[key])
+            return bucket.consume()
+
+
+class DedupEntry:
+    def __init__(self, log, record: LogRecord):
+        self.log = log
+        self.record = record
+        self.started = time.monotonic()
+        self.repeats = 0
+        self.last_seen = None
+
+
+class DedupWindow:
+    """
+        Saved log records of last "window" seconds by key. Repeats of record are counted, not saved.
+    """
+    def __init__(self, window: float):
+        self.window = window
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_key(record: LogRecord) -> tuple:
+        if hasattr(record, 'object'):
+            obj = (getattr(record.object, 'LOG_NAME', None), record.object.id)
+        else:
+            obj = (getattr(record, 'object_name', None), getattr(record, 'object_id', None))
+        func_name = '%s.%s; line %s' % (record.module, record.funcName, record.lineno)
+        return (func_name, str(record.msg), record.levelname) + obj
+
+    def add_repeat(self, key: tuple, seen) -> bool:
+        """
+            count record as repeat of saved one
+        :return: False if there is no saved record with such key in window
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or time.monotonic() - entry.started >= self.window:
+                return False
+            entry.repeats += 1
+            entry.last_seen = seen
+            return True
+
+    def add(self, key: tuple, log, record: LogRecord) -> List[DedupEntry]:
+        """
+            remember saved record
+        :return: replaced expired entry (with not saved repeats count)
+        """
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            self.entries[key] = DedupEntry(log, record)
+        return [entry] if entry and entry.repeats else []
+
+    def pop_expired(self, pop_all: bool = False) -> List[DedupEntry]:
+        """
+        :return: expired entries with repeats
+        """
+        now = time.monotonic()
+        expired = []
+        with self.lock:
+            # entries are ordered by start time
+            while self.entries:
+                key, entry = next(iter(self.entries.items()))
+                if not pop_all and now - entry.started < self.window:
+                    break
+                del self.entries[key]
+                if entry.repeats:
+                    expired.append(entry)
+        return expired
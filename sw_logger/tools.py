@@ -1,10 +1,13 @@
 import django.forms
 import datetime
+import functools
 import decimal
 
 from collections import OrderedDict
-from typing import List, Type, Optional
-from django.db.models import Model, ForeignKey, UUIDField, ManyToManyField
+from typing import List, Type, Optional, Dict, Iterable, Tuple
+from django.db import transaction, router
+from django.db.models import Model, ForeignKey, UUIDField, ManyToManyField, Subquery
+from django.db.models.functions import Coalesce
 from django.db.models.fields.files import FieldFile
 from django.db.models.query import ValuesListIterable, QuerySet
 from django.apps import apps
@@ -13,24 +16,67 @@ from . import LoggerException
 from . import models
 
 
+class ModelInfo:
+    """
+        precomputed metadata of model under logging
+    """
+    def __init__(self, model: Type[Model]):
+        self.model = model
+        self.fields = OrderedDict((field.name, field) for field in model._meta.fields)
+        self.fk_fields = [field for field in model._meta.fields if isinstance(field, ForeignKey)]
+        # related model and field name for each FK field
+        self.fk_targets = OrderedDict((field.name, _get_fk_target(field)) for field in self.fk_fields)
+        self.m2m_fields = list(model._meta.many_to_many)
+        self.verbose_names = OrderedDict(
+            (field.name, str(field.verbose_name))
+            for field in list(model._meta.fields) + self.m2m_fields
+        )
+
+
+def _get_fk_target(field: ForeignKey) -> Tuple[Type[Model], str]:
+    field_rel = field.rel if hasattr(field, 'rel') else field.remote_field
+    if hasattr(field_rel, 'to'):
+        related_model = field_rel.to
+    else:
+        related_model = field_rel.field.related_model
+    return related_model, field_rel.field_name
+
+
+def get_log_name_models() -> List[Type[Model]]:
+    """
+    :return: all models with LOG_NAME attribute (including models with duplicated LOG_NAME)
+    """
+    return [model for model in apps.get_models() if getattr(model, 'LOG_NAME', None)]
+
+
+@functools.lru_cache(maxsize=None)
+def get_registry() -> Dict[str, ModelInfo]:
+    """
+    :return: models under logging metadata by LOG_NAME. Built once, on first call after apps loading.
+        For duplicated LOG_NAME first model used (duplicates reported by system check sw_logger.E001)
+    """
+    registry = OrderedDict()
+    for model in get_log_name_models():
+        registry.setdefault(model.LOG_NAME, ModelInfo(model))
+    return registry
+
+
 def get_models() -> List[Type[Model]]:
     """
     :return: models under logging (have LOG_NAME attribute)
     """
-    models = []
+    return [info.model for info in get_registry().values()]
 
-    for model in apps.get_models():
-        if hasattr(model, 'LOG_NAME') and model.LOG_NAME:
-            models.append(model)
 
-    return models
+def get_model_info(log_name) -> ModelInfo:
+    info = get_registry().get(log_name)
+    if not info:
+        raise LoggerException('Model with LOG_NAME "%s" not found' % log_name)
+    return info
 
 
 def get_model_by_log_name(log_name) -> Type[Model]:
-    for item in get_models():
-        if item.LOG_NAME == log_name:
-            return item
-    raise LoggerException('Model with LOG_NAME "%s" not found' % log_name)
+    return get_model_info(log_name).model
 
 
 def get_models_choices() -> List:
@@ -49,13 +95,10 @@ def object_from_log(log: models.Log) -> Optional[Model]:
     if not object_data:
         return
 
-    model = get_model_by_log_name(log.object_name)
-
-    fields = {}
-    for field in model._meta.fields:
-        fields[field.name] = field
+    model_info = get_model_info(log.object_name)
+    fields = model_info.fields
 
-    model_object = model()
+    model_object = model_info.model()
 
     # first - "id", for many-to-many recreation
     if 'id' in fields:
@@ -77,41 +120,72 @@ def object_from_log(log: models.Log) -> Optional[Model]:
     return model_object
 
 
+def fetch_related_objects(logs: Iterable[models.Log]) -> Dict[Tuple[Type[Model], str], Dict[str, Model]]:
+    """
+        fetch all FK and many-to-many objects referenced in logs object data by one query per related model
+    :return: {(related model, field name): {str(field value): related object}}
+    """
+    values = OrderedDict()
+    for log in logs:
+        if log.object_data is None:
+            continue
+
+        object_data = log.get_object_data()
+        model_info = get_model_info(log.object_name)
+
+        for field_name, target in model_info.fk_targets.items():
+            value = object_data.get(field_name)
+            if value is not None:
+                values.setdefault(target, set()).add(value)
+
+        for field in model_info.m2m_fields:
+            target = (field.related_model, field.related_model._meta.pk.name)
+            values.setdefault(target, set()).update(object_data.get(field.name) or [])
+
+    related_objects = {}
+    for (related_model, field_name), field_values in values.items():
+        related_qs = related_model._default_manager.filter(**{field_name + '__in': field_values})
+        related_objects[(related_model, field_name)] = {
+            str(getattr(obj, field_name)): obj for obj in related_qs
+        }
+
+    return related_objects
+
+
 def object_display_from_log(log: models.Log) -> Optional[dict]:
     """
     :param log:
     :return: human oriented object data representation (use verbose names and etc)
     """
-    if not log.object_data:
+    if log.object_data is None:
         return
 
+    # can be prefetched for list of logs by tools.prefetch_changes
+    related_objects = getattr(log, '_related_objects', None)
+    if related_objects is None:
+        related_objects = fetch_related_objects([log])
+
     display_data = OrderedDict()
     object_data = log.get_object_data()
-    model = get_model_by_log_name(log.object_name)
+    model_info = get_model_info(log.object_name)
 
-    for field in model._meta.fields:
+    for field in model_info.fields.values():
         value = object_data.get(field.name)
 
-        if isinstance(field, ForeignKey):
-            filter_params = {}
-            field_rel = field.rel if hasattr(field, 'rel') else field.remote_field
-            filter_params[field_rel.field_name] = value
-            if hasattr(field_rel, 'to'):
-                related_qs = field_rel.to.objects.filter(**filter_params)
-            else:
-                related_qs = field_rel.field.related_model.objects.filter(**filter_params)
-            if len(related_qs):
-                value = related_qs[0]
+        # replace FK value by related object, if it still exists
+        if field.name in model_info.fk_targets and value is not None:
+            objects = related_objects.get(model_info.fk_targets[field.name], {})
+            value = objects.get(str(value), value)
 
         if isinstance(value, list):
             value = ', '.join(value)
 
-        display_data[str(field.verbose_name)] = value
+        display_data[model_info.verbose_names[field.name]] = value
 
-    for field in model._meta.many_to_many:
-        value = object_data.get(field.name, [])
-        related_qs = field.related_model.objects.filter(pk__in=value)
-        display_data[str(field.verbose_name)] = ', '.join(sorted([str(i) for i in related_qs]))
+    for field in model_info.m2m_fields:
+        objects = related_objects.get((field.related_model, field.related_model._meta.pk.name), {})
+        values = [str(objects.get(str(pk), pk)) for pk in object_data.get(field.name) or []]
+        display_data[model_info.verbose_names[field.name]] = ', '.join(sorted(values))
 
     return display_data
 
@@ -136,6 +210,147 @@ def get_changes_display(previous_log: models.Log, current_log: models.Log) -> Op
     return changes_display
 
 
+def stored_changes_display(log: models.Log) -> Optional[dict]:
+    """
+    :return: human oriented representation of changes stored on log writing
+    """
+    display_data = log.get_object_data_display()
+    if not display_data:
+        return
+
+    verbose_names = get_model_info(log.object_name).verbose_names
+    changed_names = {verbose_names.get(field_name) for field_name in log.changes}
+    return OrderedDict(
+        (name, value) for name, value in display_data.items()
+        if name in changed_names
+    )
+
+
+def get_object_delta(previous_data: dict, object_data: dict) -> dict:
+    """
+    :return: fields changed since previous object data
+    """
+    return OrderedDict(
+        (field_name, value) for field_name, value in object_data.items()
+        if field_name not in previous_data or previous_data[field_name] != value
+    )
+
+
+def get_last_object_state(log_model: Type[models.Log], object_name: str, object_id: int) -> Optional[dict]:
+    """
+        full object data of last log of object (None if object has no logs with data)
+    """
+    last_log = log_model.objects.filter(
+        object_name=object_name, object_id=object_id, object_data__isnull=False,
+    ).order_by('-id').first()
+    if last_log is None:
+        return
+    return last_log.get_object_data()
+
+
+def reconstruct_object_data(log: models.Log) -> Optional[dict]:
+    """
+        full object data of delta log record: keyframe of its chain with following deltas of chain applied
+        (records of other processes are not applied). If keyframe deleted (for example, by retention) data is partial.
+    """
+    delta = log.object_data
+
+    # previous log prefetched by prefetch_changes
+    previous_log = getattr(log, '_previous_object_log', None)
+    if previous_log and previous_log.object_data is not None \
+            and previous_log.object_data_chain == log.object_data_chain:
+        object_data = dict(previous_log.get_object_data())
+        object_data.update(delta)
+        return object_data
+
+    log_model = type(log)
+    chain_qs = log_model.objects.using(log._state.db).filter(
+        object_name=log.object_name, object_id=log.object_id, object_data__isnull=False,
+        object_data_chain=log.object_data_chain,
+    )
+    keyframe_qs = chain_qs.filter(id__lte=log.id, object_data_delta=False).order_by('-id').values('id')[:1]
+
+    object_data = OrderedDict()
+    rows = chain_qs.filter(
+        id__gte=Coalesce(Subquery(keyframe_qs), 0), id__lt=log.id,
+    ).order_by('id').values_list('object_data', flat=True)
+    for data in rows:
+        object_data.update(data)
+    object_data.update(delta)
+
+    return object_data
+
+
+def prefetch_changes(logs: Iterable[models.Log]) -> List[models.Log]:
+    """
+        fetch previous log records for all logs (for example, page of log list) by one query
+        and related objects for its display by one query per related model,
+        so log.get_changes() not query db for each log
+    :return: list of logs
+    """
+    logs = list(logs)
+    # previous logs are not needed for stored changes (except reconstruction of delta data)
+    object_logs = [
+        log for log in logs
+        if log.object_data is not None and (log.changes is None or log.object_data_delta)
+    ]
+    if not logs:
+        return logs
+
+    # previous ids may be already annotated by Log.objects.with_previous()
+    previous_ids = {}
+    not_annotated_ids = []
+    for log in object_logs:
+        if hasattr(log, 'previous_object_log_id'):
+            previous_ids[log.id] = log.previous_object_log_id
+        else:
+            not_annotated_ids.append(log.id)
+
+    log_model = type(logs[0])
+    # same db as logs (can be read replica, see SW_LOGGER_READ_DATABASE)
+    log_qs = log_model.objects.using(logs[0]._state.db)
+    if not_annotated_ids:
+        previous_ids.update(
+            log_qs.filter(id__in=not_annotated_ids).with_previous()
+            .order_by().values_list('id', 'previous_object_log_id')
+        )
+
+    logs_by_id = {log.id: log for log in logs}
+    missing_ids = [
+        previous_id for previous_id in previous_ids.values()
+        if previous_id is not None and previous_id not in logs_by_id
+    ]
+    if missing_ids:
+        logs_by_id.update(log_qs.in_bulk(missing_ids))
+
+    for log in object_logs:
+        log._previous_object_log = logs_by_id.get(previous_ids.get(log.id))
+
+    # FK and many-to-many objects for display of logs and its previous logs
+    related_objects = fetch_related_objects(logs_by_id.values())
+    for log in logs_by_id.values():
+        log._related_objects = related_objects
+
+    return logs
+
+
+def save_logs(logs: List[models.Log]) -> None:
+    """
+        save log records with minimum of queries
+    """
+    if not logs:
+        return
+
+    model = type(logs[0])
+    if model._meta.parents:
+        # bulk_create not supported for multi-table inherited models (customized log model)
+        with transaction.atomic(using=router.db_for_write(model)):
+            for log in logs:
+                log.save()
+    else:
+        model.objects.bulk_create(logs)
+
+
 def model_to_dict(obj: Model) -> dict:
     obj_dict = django.forms.model_to_dict(obj)
     obj_dict = _converter(obj_dict)
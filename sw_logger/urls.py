@@ -1,5 +1,3 @@
-from django.conf.urls import url
-
 urlpatterns = [
 
-]
\ No newline at end of file
+]
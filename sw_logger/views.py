@@ -1,10 +1,41 @@
-from django.views.generic import TemplateView
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+import datetime
+from typing import Optional
+import django
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, Http404, HttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.generic import TemplateView, View
+from django.core.paginator import EmptyPage, PageNotAnInteger
 
 from . import models
 from . import forms
 from . import filters
 from . import consts
+from . import tools
+from . import retention
+from . import paginators
+from . import routers
+from . import stats
+from . import history
+from . import metrics
+from .exceptions import LoggerException
+
+
+def parse_date(value: Optional[str]) -> Optional[datetime.datetime]:
+    """
+        aware datetime from ISO string of GET parameter
+    :raise ValueError: for wrong date
+    """
+    if not value:
+        return
+    # parse_datetime raises ValueError for well formatted, but invalid date ("2024-13-01T00:00")
+    date = parse_datetime(value)
+    if date is None:
+        raise ValueError('Wrong date "%s"' % value)
+    if timezone.is_naive(date):
+        date = timezone.make_aware(date)
+    return date
 
 
 class Log(TemplateView):
@@ -13,12 +44,18 @@ class Log(TemplateView):
     form_class = forms.Log
     filter_class = filters.Log
     paginate_by = 30
+    cursor_pagination = False   # "next"/"previous" pages by (created, id) cursor instead of page numbers
+    count_limit = None          # count records up to limit only
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
         qs = self.get_queryset()
         context['page'] = self._get_page(qs)
+        self._fill_context(context, qs)
+        return context
+
+    def _fill_context(self, context, qs):
         context['object_list'] = qs
 
         context['LOG_LEVEL_CRITICAL'] = consts.LOG_LEVEL_CRITICAL
@@ -32,7 +69,11 @@ class Log(TemplateView):
         form.is_valid()
         context['form'] = form
 
-        return context
+        # query string without page number and cursor, for pagination links
+        filter_params = self.request.GET.copy()
+        filter_params.pop('page', None)
+        filter_params.pop('cursor', None)
+        context['filter_params'] = filter_params.urlencode()
 
     def get_form(self):
         return self.form_class(self.request.GET or None)
@@ -41,14 +82,22 @@ class Log(TemplateView):
         form = self.get_form()
         if form.is_valid():
             params = form.cleaned_data
-            qs = self.model.objects.all()
+            qs = retention.filter_actual(self.model.objects.using(routers.get_read_database()))
             qs = self.filter_class(params, qs).qs
             return qs
         else:
             return self.model.objects.none()
 
     def _get_page(self, qs):
-        paginator = Paginator(qs, self.paginate_by)
+        if self.cursor_pagination:
+            paginator = paginators.CursorPaginator(
+                qs, self.paginate_by, count_limit=self.count_limit, with_count=self.count_limit is not None,
+            )
+            page = paginator.page(self.request.GET.get('cursor'))
+            tools.prefetch_changes(page.object_list)
+            return page
+
+        paginator = paginators.CappedCountPaginator(qs, self.paginate_by, count_limit=self.count_limit)
 
         page_num = self.request.GET.get('page')
         try:
@@ -58,5 +107,125 @@ class Log(TemplateView):
         except EmptyPage:
             page = paginator.page(paginator.num_pages)
 
+        tools.prefetch_changes(page.object_list)
         return page
 
+
+# async ORM (queryset async iteration, acount) appeared in Django 4.1
+if django.VERSION >= (4, 1):
+    class AsyncLog(Log):
+        """
+            Log view for ASGI. Page records are fetched by async ORM, without blocking event loop
+        """
+        async def get(self, request, *args, **kwargs):
+            context = await self.aget_context_data(**kwargs)
+            return self.render_to_response(context)
+
+        async def aget_context_data(self, **kwargs):
+            context = super(Log, self).get_context_data(**kwargs)
+
+            qs = self.get_queryset()
+            context['page'] = await self._aget_page(qs)
+            self._fill_context(context, qs)
+            return context
+
+        async def _aget_page(self, qs):
+            if self.cursor_pagination:
+                paginator = paginators.CursorPaginator(
+                    qs, self.paginate_by, count_limit=self.count_limit, with_count=self.count_limit is not None,
+                )
+                page = await paginator.apage(self.request.GET.get('cursor'))
+            else:
+                paginator = paginators.CappedCountPaginator(qs, self.paginate_by, count_limit=self.count_limit)
+
+                page_num = self.request.GET.get('page')
+                try:
+                    page = await paginator.apage(page_num)
+                except PageNotAnInteger:
+                    page = await paginator.apage(1)
+                except EmptyPage:
+                    page = await paginator.apage(paginator.num_pages)
+
+            await sync_to_async(tools.prefetch_changes)(page.object_list)
+            return page
+
+
+class Stats(View):
+    """
+        JSON with number of log records by time buckets (see sw_logger.stats.get_stats).
+        GET parameters:
+            group_by - dimensions separated by comma, for example "level,object_name"
+            period - "hour" or "day"
+            date_from, date_to - ISO datetime
+            level, action, object_name, user_id, username - filters (can be repeated)
+    """
+    def get(self, request, *args, **kwargs):
+        params = request.GET
+        group_by = [name for name in params.get('group_by', '').split(',') if name]
+
+        filters = {}
+        for name in stats.DIMENSIONS:
+            values = params.getlist(name)
+            if values:
+                filters[name + '__in'] = values
+
+        try:
+            rows = stats.get_stats(
+                group_by=group_by,
+                period=params.get('period', stats.PERIOD_HOUR),
+                date_from=parse_date(params.get('date_from')),
+                date_to=parse_date(params.get('date_to')),
+                **filters
+            )
+        except (LoggerException, ValueError) as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        return JsonResponse({'stats': rows})
+
+
+class Metrics(View):
+    """
+        Metrics of log records processing in Prometheus text format (see sw_logger.metrics).
+        Add access restrictions for project (by IP, staff_member_required and etc).
+    """
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(metrics.export(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class ObjectHistory(TemplateView):
+    """
+        History of one object. URL parameters: object_name (LOG_NAME of model), object_id.
+        GET parameters: before - log id for next page, at - ISO datetime for object state at that moment
+    """
+    template_name = None    # must be specified by
+    model = models.Log
+    paginate_by = 30
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        object_history = self.get_history()
+        try:
+            context['object'] = object_history.get_object()
+        except LoggerException:
+            raise Http404('Unknown object name')
+
+        before = self.request.GET.get('before')
+        context['page'] = object_history.page(int(before) if before and before.isdigit() else None, self.paginate_by)
+
+        try:
+            at = parse_date(self.request.GET.get('at'))
+        except ValueError:
+            raise Http404('Wrong date')
+        if at:
+            context['at'] = at
+            context['object_at'] = object_history.get_object_at(at)
+            context['object_data_at'] = object_history.get_state_at(at)
+
+        context['history'] = object_history
+        return context
+
+    def get_history(self) -> history.ObjectHistory:
+        return history.ObjectHistory(
+            self.kwargs['object_name'], self.kwargs['object_id'], self.model, routers.get_read_database(),
+        )